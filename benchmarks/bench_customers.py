@@ -0,0 +1,69 @@
+import argparse
+import sys
+import time
+import numpy as np
+from src.data.customers import CustomerIndex
+from src.offline.data import generate
+
+# Incremental customer index against rebuilding it from scratch.
+#
+# Builds the index from all but the newest orders, applies the rest in
+# batches of --delta orders (with their items), and times each step. The
+# result must match an index built from every row at once; exits 1 if not.
+# Run from the repo root:
+#   python -m benchmarks.bench_customers --scale 1m --delta 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time incremental updates of the per-customer index.")
+    parser.add_argument("--scale", default="100k")
+    parser.add_argument("--delta", type=int, default=100, help="orders per incremental refresh")
+    parser.add_argument("--refreshes", type=int, default=20)
+    args = parser.parse_args()
+
+    data = generate(args.scale)
+    orders = data["orders"][["id", "user_id", "amount", "created_at"]]
+    items = data["order_items"][["id", "order_id", "food_item_id", "quantity"]]
+    food_categories = data["foods"].set_index("id")["category_id"]
+
+    def batch(lo, hi):
+        chunk = orders.iloc[lo:hi]
+        return chunk, items[items["order_id"].isin(chunk["id"])]
+
+    split = len(orders) - args.delta * args.refreshes
+    index = CustomerIndex()
+    start = time.perf_counter()
+    index._apply(*batch(0, split), food_categories)
+    build_s = time.perf_counter() - start
+
+    delta_s = []
+    for lo in range(split, len(orders), args.delta):
+        chunk = batch(lo, lo + args.delta)
+        start = time.perf_counter()
+        index._apply(*chunk, food_categories)
+        delta_s.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    index.rfm()
+    index.retention()
+    views_s = time.perf_counter() - start
+
+    full = CustomerIndex()
+    full._apply(orders, items, food_categories)
+    columns = ["first_order", "last_order", "orders", "spend", "favourite_food_id", "favourite_category_id"]
+    same = (
+        index.rfm()[columns].sort_index().equals(full.rfm()[columns].sort_index())
+        and index.retention().equals(full.retention())
+    )
+
+    print(f"{len(orders):,} orders, {len(items):,} items, {len(index.rfm()):,} customers")
+    print(f"build {build_s * 1000:.0f} ms for {split:,} orders")
+    print(f"refresh of {args.delta} orders: median {np.median(delta_s) * 1000:.1f} ms, max {max(delta_s) * 1000:.1f} ms")
+    print(f"views (RFM + retention) {views_s * 1000:.0f} ms, rebuilt once per refresh")
+    if not same:
+        print("FAIL: incremental index differs from a full rebuild")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import subprocess
+import sys
+
+# Cold-start import cost of the login path, from `python -X importtime`.
+#
+# Imports src.main (everything the login screen needs) in fresh interpreters,
+# reports its cumulative import time and the slowest modules, and checks that
+# the heavy data stack stays deferred until a page is opened. Run from the
+# repo root:
+#   python -m benchmarks.bench_import_time --repeat 5 --budget-ms 1500
+
+# Must not be imported before login; page modules load them on navigation
+DEFERRED = ("pandas", "altair", "supabase", "numpy", "pyarrow")
+
+
+def import_times(module):
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time of the login path.")
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--compare", default="src.pages.analytics", help="module to report for contrast")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, help="exit 1 when the best run exceeds this")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times[args.module][1])
+    total_ms = best[args.module][1] / 1000
+    compare_ms = min(import_times(args.compare)[args.compare][1] for _ in range(args.repeat)) / 1000
+
+    print(f"{args.module}: {total_ms:.1f} ms cumulative, {len(best)} modules (best of {args.repeat})")
+    print(f"{args.compare}: {compare_ms:.1f} ms cumulative (deferred until navigation)")
+    print("slowest modules by self time:")
+    for name, (self_us, _) in sorted(best.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    leaked = [name for name in DEFERRED if name in best]
+    if leaked:
+        print(f"FAIL: imported before login: {', '.join(leaked)}")
+        failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Page and widget render benchmarks against the offline Supabase stand-in.
+#
+# Every (scale, target) pair runs in a fresh process under Streamlit's AppTest
+# harness: one cold run (empty caches) and one warm rerun. For each we report
+# wall time, backend queries and response KB, plus the process's peak RSS.
+# Regressions are gated on queries and KB, which are deterministic for a given
+# scale; timings and RSS vary by machine and are only reported against the
+# baseline. Run from the repo root:
+#   python -m benchmarks.bench_pages --scales 10k 100k
+#   python -m benchmarks.bench_pages --save-baseline benchmarks/baseline.json
+#   python -m benchmarks.bench_pages --baseline benchmarks/baseline.json   # exit 1 on regression
+
+TARGETS = {
+    "home": "from src.pages import home\nhome.show()",
+    "analytics": "from src.pages import analytics\nanalytics.show()",
+    "monthly_summary": "from src.widgets import monthly_summary\nmonthly_summary.show()",
+    "weekday_analysis": "from src.widgets.weekday_analysis import render_weekday_analysis\nrender_weekday_analysis()",
+    "daily_insights": (
+        "from src.data.catalog import fetch_catalog\n"
+        "from src.widgets.daily_insight import render_daily_insights\n"
+        "render_daily_insights(**fetch_catalog())"
+    ),
+}
+
+# The Analytics page with one section opened, as a user would pick it
+ANALYTICS_SECTIONS = {
+    "analytics_monthly": "📆 Monthly Summary",
+    "analytics_weekday": "📅 Weekday Analysis",
+    "analytics_daily": "📅 Daily Insights",
+    "analytics_live": "🔴 Live",
+    "analytics_customers": "👥 Customers",
+    "analytics_export": "📤 Export",
+}
+TARGETS.update({name: TARGETS["analytics"] for name in ANALYTICS_SECTIONS})
+
+# A gated metric regresses when it exceeds baseline * (1 + tolerance) + slack
+SLACK = {"cold_queries": 0, "warm_queries": 0, "cold_kb": 1, "warm_kb": 1}
+
+# Reported next to the baseline when they grow past --timing-tolerance, never failing the run
+INFORMATIONAL = ("cold_ms", "warm_ms", "peak_rss_mb")
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_target(target):
+    from streamlit.testing.v1 import AppTest
+    from src import metrics
+    from src.data.customers import customer_index
+    from src.supabase_client import get_client
+
+    client = get_client()  # generates the synthetic data up front
+
+    setup_rss = _peak_rss_mb()
+    at = AppTest.from_string(TARGETS[target], default_timeout=600)
+    at.session_state["logged_in"] = True
+    if target in ANALYTICS_SECTIONS:
+        at.session_state["analytics_section"] = ANALYTICS_SECTIONS[target]
+    result = {"setup_rss_mb": round(setup_rss, 1)}
+    for phase in ("cold", "warm"):
+        queries = client.queries
+        received = metrics.total("supabase_response_bytes_total")
+        start = time.perf_counter()
+        at.run()
+        # The customer index is first built in the background; the cold run includes that build
+        if phase == "cold" and target == "analytics_customers" and customer_index.wait_built():
+            at.run()
+        result[f"{phase}_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        result[f"{phase}_queries"] = client.queries - queries
+        result[f"{phase}_kb"] = round((metrics.total("supabase_response_bytes_total") - received) / 1024, 1)
+        if at.exception:
+            raise SystemExit(f"{target}: {at.exception[0].message}")
+    result["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    return result
+
+
+def measure(scale, target, latency_ms):
+    env = dict(os.environ, FAKE_SUPABASE="1", FAKE_SUPABASE_SCALE=scale, FAKE_SUPABASE_LATENCY_MS=str(latency_ms))
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_pages", "--worker", target],
+        env=env, capture_output=True, text=True,
+    )
+    if out.returncode:
+        raise SystemExit(f"{scale}/{target} failed:\n{out.stderr or out.stdout}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def regressions(results, baseline, tolerance, metrics=SLACK):
+    found = []
+    for key, values in results.items():
+        for metric, value in values.items():
+            base = baseline.get(key, {}).get(metric)
+            if metric in metrics and base is not None and value > base * (1 + tolerance) + SLACK.get(metric, 0):
+                found.append(f"{key} {metric}: {value} vs baseline {base}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark page and widget renders on synthetic data.")
+    parser.add_argument("--scales", nargs="+", default=["10k", "100k"])
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated round trip per query")
+    parser.add_argument("--baseline", help="compare against this JSON file and exit 1 on regression")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="allowed growth of queries and KB")
+    parser.add_argument("--timing-tolerance", type=float, default=0.25, help="growth of timings and RSS worth reporting")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_target(args.worker)))
+        return
+
+    results = {}
+    print(f"{'scale/target':<32}{'cold ms':>10}{'warm ms':>10}{'queries':>10}{'cold KB':>10}{'peak MB':>10}")
+    for scale in args.scales:
+        for target in args.targets:
+            key = f"{scale}/{target}"
+            results[key] = r = measure(scale, target, args.latency_ms)
+            queries = f"{r['cold_queries']}/{r['warm_queries']}"
+            print(f"{key:<32}{r['cold_ms']:>10.1f}{r['warm_ms']:>10.1f}{queries:>10}{r['cold_kb']:>10.1f}{r['peak_rss_mb']:>10.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for line in regressions(results, baseline, args.timing_tolerance, INFORMATIONAL):
+            print(f"slower  {line}")
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
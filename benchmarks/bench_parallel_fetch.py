@@ -0,0 +1,67 @@
+import argparse
+import os
+import time
+
+# Sequential vs concurrent page-load fetches.
+#
+# Runs the loaders the Monthly Summary section fetches together (catalog,
+# rollup cube, user sketches) against the offline Supabase stand-in with an
+# injected round-trip latency, first one after another and then through
+# fetch_concurrently, clearing every cache before each run. The cube's day
+# windows are read one after another, so the slowest loader bounds the
+# concurrent run. Run from the repo root:
+#   python -m benchmarks.bench_parallel_fetch --scale 100k --latency-ms 40
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sequential and concurrent page-load fetches.")
+    parser.add_argument("--scale", default="10k")
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Configure the stand-in before anything builds the client
+    os.environ["FAKE_SUPABASE"] = "1"
+    os.environ["FAKE_SUPABASE_SCALE"] = args.scale
+    os.environ["FAKE_SUPABASE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["FAKE_SUPABASE_JITTER_MS"] = str(args.jitter_ms)
+
+    from src.data.catalog import catalog, fetch_catalog
+    from src.data.parallel import fetch_concurrently
+    from src.data.repository import invalidate
+    from src.data.rollups import fetch_cube
+    from src.data.sketches import fetch_user_sketches
+    from src.supabase_client import get_client
+
+    client = get_client()  # generates the synthetic data up front
+    loaders = {"catalog": fetch_catalog, "order_rollup": fetch_cube, "user_sketches": fetch_user_sketches}
+
+    def cold(run):
+        invalidate()
+        catalog.invalidate()
+        queries = client.queries
+        start = time.perf_counter()
+        run()
+        return time.perf_counter() - start, client.queries - queries
+
+    def sequential():
+        for load in loaders.values():
+            load()
+
+    per_loader = {name: min(cold(load) for _ in range(args.repeat)) for name, load in loaders.items()}
+    runs = {
+        "sequential": min(cold(sequential) for _ in range(args.repeat)),
+        "concurrent": min(cold(lambda: fetch_concurrently(loaders)) for _ in range(args.repeat)),
+    }
+
+    print(f"{args.scale} orders, {args.latency_ms:.0f} ms (+ up to {args.jitter_ms:.0f} ms) per request, best of {args.repeat}")
+    for name, (seconds, queries) in per_loader.items():
+        print(f"  {name:<14} {seconds * 1000:8.1f} ms  {queries:4d} requests")
+    for name, (seconds, queries) in runs.items():
+        print(f"{name}: {seconds * 1000:8.1f} ms  {queries:4d} requests")
+    print(f"speedup:    {runs['sequential'][0] / runs['concurrent'][0]:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
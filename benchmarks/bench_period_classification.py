@@ -0,0 +1,51 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.data.frames import day_period, shift_of
+
+# Per-row cost of classifying order hours, Python callback vs vectorized.
+# Run from the repo root:
+#   python -m benchmarks.bench_period_classification --rows 1000000
+
+
+def get_period(hour):
+    return "Night" if hour < 6 or hour >= 18 else "Day"
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time day/night and shift classification per row.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hours = pd.Series(rng.integers(0, 24, args.rows), dtype="int8")
+    categories = pd.DataFrame({"id": np.arange(500), "name": [f"Category {i}" for i in range(500)]})
+
+    cases = {
+        "hour.apply(get_period)": lambda: hours.apply(get_period),
+        "day_period (np.where)": lambda: day_period(hours.to_numpy()),
+        "shift_of (searchsorted)": lambda: shift_of(hours.to_numpy()),
+        "category map, iterrows (500 rows)": lambda: {row["id"]: row["name"] for _, row in categories.iterrows()},
+        "category map, zip (500 rows)": lambda: dict(zip(categories["id"], categories["name"])),
+    }
+
+    print(f"{args.rows:,} orders, best of {args.repeat}")
+    for name, fn in cases.items():
+        seconds = best_of(args.repeat, fn)
+        rows = len(categories) if "category" in name else args.rows
+        print(f"{name:36s} {seconds * 1000:9.2f} ms  {seconds / rows * 1e9:8.1f} ns/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import os
+import threading
+import time
+
+# Several sessions opening the Analytics page at once.
+#
+# Each simulated session loads the rollup cube from a cold cache against the
+# offline Supabase stand-in; with single-flight coalescing only one of them
+# queries the backend and the rest wait for its result. Run from the repo root:
+#   python -m benchmarks.bench_shared_cache --sessions 8 --latency-ms 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent cold loads through the shared cache.")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--scale", default="10k")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    os.environ.update(FAKE_SUPABASE="1", FAKE_SUPABASE_SCALE=args.scale, FAKE_SUPABASE_LATENCY_MS=str(args.latency_ms))
+    from src.supabase_client import get_client
+    from src.data.repository import cache_stats
+    from src.data.rollups import fetch_cube
+
+    client = get_client()
+
+    start = time.perf_counter()
+    sessions = [threading.Thread(target=fetch_cube) for _ in range(args.sessions)]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    elapsed = time.perf_counter() - start
+
+    stats = cache_stats()
+    print(f"{args.sessions} sessions, {args.scale} orders, {args.latency_ms:.0f} ms per query")
+    print(f"wall time:        {elapsed * 1000:8.1f} ms")
+    print(f"backend queries:  {client.queries:8d}")
+    print(f"coalesced loads:  {stats['coalesced']:8d}")
+    print(f"cached:           {stats['entries']} entries, {stats['bytes'] / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import sys
+import time
+import numpy as np
+from src.data.sketches import REGISTERS, DailySketches, sketch_rows
+from src.offline.data import generate
+
+# Error and speed of sketch-based unique users against exact counting.
+#
+# Builds the per-day sketches for synthetic orders, then for random day
+# ranges (and weekdays) compares the merged estimate with nunique() over the
+# raw rows. Exits 1 if any relative error exceeds --max-error (default: three
+# standard errors, 3 * 1.04 / sqrt(registers)). Run from the repo root:
+#   python -m benchmarks.bench_unique_users --scale 100k --ranges 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bound the error of HyperLogLog unique-user counts.")
+    parser.add_argument("--scale", default="100k")
+    parser.add_argument("--ranges", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-error", type=float, default=3 * 1.04 / REGISTERS ** 0.5)
+    args = parser.parse_args()
+
+    orders = generate(args.scale)["orders"]
+    start = time.perf_counter()
+    sketches = DailySketches(sketch_rows(orders))
+    build_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(args.seed)
+    days = sketches.days
+    dates = orders["created_at"].dt.tz_localize(None).to_numpy().astype("datetime64[D]")
+    weekdays = orders["created_at"].dt.weekday.to_numpy()
+    users = orders["user_id"].to_numpy()
+
+    errors, sketch_s, exact_s = [], 0.0, 0.0
+    for _ in range(args.ranges):
+        lo, hi = sorted(rng.integers(0, len(days) + 1, 2))
+        hi = max(hi, lo + 1)
+        weekday = int(rng.integers(0, 7)) if rng.random() < 0.3 else None
+        start_day, end_day = days[lo], days[hi] if hi < len(days) else days[-1] + 1
+
+        start = time.perf_counter()
+        estimate = sketches.unique(start_day, end_day, weekday)
+        sketch_s += time.perf_counter() - start
+
+        start = time.perf_counter()
+        mask = (dates >= start_day) & (dates < end_day)
+        if weekday is not None:
+            mask &= weekdays == weekday
+        exact = len(np.unique(users[mask]))
+        exact_s += time.perf_counter() - start
+
+        if exact:
+            errors.append(abs(estimate - exact) / exact)
+
+    errors = np.array(errors)
+    print(f"{len(orders):,} orders over {len(days)} days, sketches built in {build_s * 1000:.0f} ms")
+    print(f"{len(errors)} ranges: mean error {errors.mean():.2%}, p95 {np.percentile(errors, 95):.2%}, max {errors.max():.2%}")
+    print(f"per query: sketch {sketch_s / args.ranges * 1000:.2f} ms, exact {exact_s / args.ranges * 1000:.2f} ms")
+    if errors.max() > args.max_error:
+        print(f"FAIL: max error above {args.max_error:.2%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
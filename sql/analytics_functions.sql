@@ -0,0 +1,104 @@
+-- Server-side aggregates for the analytics page.
+--
+-- Every function takes an optional [start_ts, end_ts) range on created_at
+-- (NULL means unbounded) and returns a handful of grouped rows, so the
+-- dashboard never downloads raw order history just to sum it. Days and hours
+-- are UTC whatever the session TimeZone, matching the app's UTC bucketing.
+--
+-- Apply with the Supabase SQL editor, `supabase db push`, or against a
+-- local Postgres: psql "$DATABASE_URL" -f sql/analytics_functions.sql
+
+create index if not exists orders_created_at_idx on orders (created_at);
+create index if not exists order_items_created_at_idx on order_items (created_at);
+create index if not exists order_item_addons_order_item_id_idx on order_item_addons (order_item_id);
+
+
+-- Headline metrics: orders, revenue, unique users, items sold
+create or replace function order_totals(start_ts timestamptz default null, end_ts timestamptz default null)
+returns table (orders bigint, revenue numeric, unique_users bigint, items_sold bigint)
+language sql stable as $$
+    select
+        count(*),
+        coalesce(sum(o.amount), 0),
+        count(distinct o.user_id),
+        (
+            select coalesce(sum(i.quantity), 0)
+            from order_items i
+            where (start_ts is null or i.created_at >= start_ts)
+              and (end_ts is null or i.created_at < end_ts)
+        )
+    from orders o
+    where (start_ts is null or o.created_at >= start_ts)
+      and (end_ts is null or o.created_at < end_ts);
+$$;
+
+
+-- Rollup cube shared by the analytics widgets, one row per group in three grains:
+--   (day, hour)                    -> orders, revenue
+--   (day, food_item_id, category)  -> quantity, addons attached to those items
+--   (day, addon_id)                -> addons (times chosen)
+-- Key columns outside a row's grain are NULL, as are measures that do not apply.
+create or replace function order_rollup(start_ts timestamptz default null, end_ts timestamptz default null)
+returns table (
+    day date, hour int, food_item_id bigint, category_id bigint, addon_id bigint,
+    orders bigint, revenue numeric, quantity bigint, addons bigint
+)
+language sql stable as $$
+    select
+        (o.created_at at time zone 'UTC')::date, extract(hour from o.created_at at time zone 'UTC')::int, null::bigint, null::bigint, null::bigint,
+        count(*), coalesce(sum(o.amount), 0), null::bigint, null::bigint
+    from orders o
+    where (start_ts is null or o.created_at >= start_ts)
+      and (end_ts is null or o.created_at < end_ts)
+    group by 1, 2
+
+    union all
+
+    select
+        (i.created_at at time zone 'UTC')::date, null::int, i.food_item_id, f.category_id, null::bigint,
+        null::bigint, null::numeric, sum(i.quantity),
+        sum((select count(*) from order_item_addons a where a.order_item_id = i.id))
+    from order_items i
+    join foods f on f.id = i.food_item_id
+    where (start_ts is null or i.created_at >= start_ts)
+      and (end_ts is null or i.created_at < end_ts)
+    group by 1, 3, 4
+
+    union all
+
+    select
+        (i.created_at at time zone 'UTC')::date, null::int, null::bigint, null::bigint, a.addon_id,
+        null::bigint, null::numeric, null::bigint, count(*)
+    from order_item_addons a
+    join order_items i on i.id = a.order_item_id
+    where (start_ts is null or i.created_at >= start_ts)
+      and (end_ts is null or i.created_at < end_ts)
+    group by 1, 5;
+$$;
+
+
+-- Per-day HyperLogLog sketches of orders.user_id (see src/data/sketches.py):
+-- 4096 registers per day as a hex string, one byte each. The hash is the first
+-- 8 bytes of md5(user_id); the low 12 bits pick the register and the rank is
+-- the position of the first 1 bit in the next 51. Days merge with a max.
+create or replace function user_sketches(start_ts timestamptz default null, end_ts timestamptz default null)
+returns table (day date, registers text)
+language sql stable as $$
+    with hashed as (
+        select (o.created_at at time zone 'UTC')::date as day, ('x' || substr(md5(o.user_id::text), 1, 16))::bit(64)::bigint as h
+        from orders o
+        where o.user_id is not null
+          and (start_ts is null or o.created_at >= start_ts)
+          and (end_ts is null or o.created_at < end_ts)
+    ),
+    ranks as (
+        select day, (h & 4095)::int as register, max(52 - length(ltrim(((h >> 12)::bit(51))::text, '0'))) as rank
+        from hashed
+        group by 1, 2
+    )
+    select d.day, string_agg(lpad(to_hex(coalesce(r.rank, 0)), 2, '0'), '' order by g.register)
+    from (select distinct day from ranks) d
+    cross join generate_series(0, 4095) as g(register)
+    left join ranks r on r.day = d.day and r.register = g.register
+    group by d.day;
+$$;
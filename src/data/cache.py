@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Process-wide cache shared by every Streamlit session.
+#
+# Entries expire after a TTL and are evicted least-recently-used once the
+# cache holds more than max_entries or max_bytes. Concurrent misses on the same
+# key are coalesced: the first caller loads, the others wait for its result.
+# Keys start with a table (or RPC) name; invalidate() bumps that name's
+# generation so a load that was already in flight is not stored over it, and
+# callers arriving after the invalidation start a new load instead of waiting
+# on the old one.
+
+CACHE_MAX_BYTES = int(float(os.getenv("CACHE_MAX_MB", "512")) * 2**20)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+
+
+# Approximate in-memory footprint of a cached value
+def size_of(value, _depth=0):
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if _depth > 4:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(size_of(v, _depth + 1) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        if len(value) > 100:
+            # Sample long lists of rows instead of walking all of them
+            return sys.getsizeof(value) + len(value) * size_of(value[0], _depth + 1)
+        return sys.getsizeof(value) + sum(size_of(v, _depth + 1) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + size_of(vars(value), _depth + 1)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class SharedCache:
+    def __init__(self, ttl, max_bytes=CACHE_MAX_BYTES, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (fetched_at, size, value)
+        self._inflight = {}
+        self._generations = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = self.evictions = 0
+
+    def _generation(self, key):
+        return self._epoch, self._generations.get(key[0], 0)
+
+    def get(self, key, load):
+        leader = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                flight = self._inflight[key] = _Flight()
+                generation = self._generation(key)
+                self.misses += 1
+                leader = True
+        if not leader:
+            return flight.wait()
+
+        fetched_at = time.monotonic()
+        size = 0
+        try:
+            flight.value = load()
+            size = size_of(flight.value)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                if flight.error is None and self._generation(key) == generation:
+                    self._store(key, fetched_at, size, flight.value)
+            flight.done.set()
+        return flight.value
+
+    def _store(self, key, fetched_at, size, value):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (fetched_at, size, value)
+        self._bytes += size
+        # Evict least recently used, but always keep the entry just stored
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    # Drop entries whose key starts with one of `names` (everything when None)
+    def invalidate(self, names=None):
+        with self._lock:
+            if names is None:
+                self._epoch += 1
+            for name in names or ():
+                self._generations[name] = self._generations.get(name, 0) + 1
+            for key in list(self._entries):
+                if names is None or key[0] in names:
+                    self._bytes -= self._entries.pop(key)[1]
+            for key in list(self._inflight):
+                if names is None or key[0] in names:
+                    del self._inflight[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
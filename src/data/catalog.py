@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+import pandas as pd
+from src.data.frames import compact
+from src.data.parallel import fetch_concurrently
+from src.data.repository import invalidate as invalidate_tables, iter_table_chunks
+from src.models.food_item import FoodItem
+from src.models.addOn import AddOn
+
+# Seconds before the whole menu is reloaded to pick up edits made by other admins (0 = never)
+REVALIDATE_SECONDS = int(os.getenv("CATALOG_REVALIDATE_SECONDS", "300"))
+
+
+# In-process menu: categories, FoodItem and AddOn objects keyed by id.
+# Loaded in three concurrent paged reads, then kept current by the admin's own
+# writes (put_*/drop_* with the rows Supabase returns) instead of being refetched.
+# Writers never mutate a published dict: they build a copy and swap it in under
+# the lock, so readers can iterate whatever dict they picked up without locking.
+class MenuCatalog:
+    def __init__(self):
+        self.categories = {}
+        self.foods = {}
+        self.addons = {}
+        self.loaded_at = None
+        # Bumped on every change so derived views (see fetch_catalog) know when to rebuild
+        self.version = 0
+        self._lock = threading.RLock()
+
+    def load(self):
+        tables = fetch_concurrently({
+            table: lambda table=table: [row for rows in iter_table_chunks(table) for row in rows]
+            for table in ("categories", "foods", "addons")
+        })
+        categories, foods, addons = tables["categories"], tables["foods"], tables["addons"]
+
+        with self._lock:
+            self.categories = {c["id"]: c for c in categories}
+            self.foods = {f["id"]: FoodItem.from_dict(f) for f in foods}
+            self.addons = {a["id"]: AddOn.from_dict(a) for a in addons}
+            self.loaded_at = time.monotonic()
+            self.version += 1
+
+    # Load on first use, and again once the revalidation period has passed
+    def ensure_fresh(self):
+        if self.loaded_at is None:
+            self.load()
+        elif REVALIDATE_SECONDS and time.monotonic() - self.loaded_at > REVALIDATE_SECONDS:
+            self.load()
+        return self
+
+    # Force a reload on next access, for writes whose result rows are unavailable
+    def invalidate(self):
+        self.loaded_at = None
+
+    # ---------- Reads ----------
+
+    def category_list(self):
+        self.ensure_fresh()
+        return list(self.categories.values())
+
+    def foods_in(self, category_id):
+        self.ensure_fresh()
+        return [f for f in self.foods.values() if f.category_id == category_id]
+
+    def addons_by_food(self):
+        self.ensure_fresh()
+        grouped = {}
+        for addon in self.addons.values():
+            grouped.setdefault(addon.food_id, []).append(addon)
+        return grouped
+
+    # ---------- Write-through ----------
+
+    def _put(self, name, rows, build):
+        if not rows:
+            self.invalidate()
+            return
+        with self._lock:
+            store = dict(getattr(self, name))
+            for row in rows:
+                store[row["id"]] = build(row)
+            setattr(self, name, store)
+            self.version += 1
+
+    def put_categories(self, rows):
+        self._put("categories", rows, dict)
+
+    # The rollup cube joins foods for their categories, so it is dropped only when
+    # a known food moves to another category (or the written rows are unknown).
+    # New foods have no orders yet and renames or price edits don't touch the cube.
+    def put_foods(self, rows):
+        foods = self.foods
+        recategorised = not rows or any(
+            row["id"] in foods and foods[row["id"]].category_id != row.get("category_id") for row in rows
+        )
+        self._put("foods", rows, FoodItem.from_dict)
+        if recategorised:
+            invalidate_tables("foods")
+
+    def put_addons(self, rows):
+        self._put("addons", rows, AddOn.from_dict)
+
+    def drop_category(self, category_id):
+        with self._lock:
+            self.categories = {k: v for k, v in self.categories.items() if k != category_id}
+            self.version += 1
+
+    def drop_food(self, food_id):
+        with self._lock:
+            self.foods = {k: v for k, v in self.foods.items() if k != food_id}
+            self.addons = {k: v for k, v in self.addons.items() if v.food_id != food_id}
+            self.version += 1
+        invalidate_tables("foods")
+
+    def drop_addon(self, addon_id):
+        with self._lock:
+            self.addons = {k: v for k, v in self.addons.items() if k != addon_id}
+            self.version += 1
+
+
+catalog = MenuCatalog()
+
+# (catalog version, frames) of the last fetch_catalog() result
+_frames = (None, None)
+
+
+# Lookup tables the analytics widgets join against, as compact read-only DataFrames
+# rebuilt only when the catalog changes
+def fetch_catalog():
+    global _frames
+    catalog.ensure_fresh()
+    version, frames = _frames
+    if version == catalog.version:
+        return frames
+
+    with catalog._lock:
+        version = catalog.version
+        frames = {
+            "foods": pd.DataFrame(
+                [{"id": f.id, "name": f.name, "category_id": f.category_id} for f in catalog.foods.values()],
+                columns=["id", "name", "category_id"],
+            ),
+            "addons": pd.DataFrame(
+                [{"id": a.id, "name": a.name} for a in catalog.addons.values()], columns=["id", "name"]
+            ),
+            "categories": pd.DataFrame(
+                [{"id": c["id"], "name": c["name"]} for c in catalog.categories.values()], columns=["id", "name"]
+            ),
+        }
+    frames = {name: compact(df) for name, df in frames.items()}
+    _frames = (version, frames)
+    return frames
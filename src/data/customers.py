@@ -0,0 +1,283 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src.supabase_client import get_client
+from src.data.repository import CACHE_TTL_SECONDS, SNAPSHOT_DIR, iter_table_chunks, sync_snapshot, table_columns, to_frame
+
+# Columns the customer index reads (declared in WIDGET_COLUMNS); everything else stays on the server
+CUSTOMER_COLUMNS = {table: table_columns(table, "customer_insights") for table in ("orders", "order_items")}
+
+# Order ids per `in` filter when looking up the users of items whose order was applied earlier
+LOOKUP_BATCH = 500
+
+# (user code, value) pairs are packed into one int64 key: code << PAIR_BITS | value
+PAIR_BITS = 32
+NO_FAVOURITE = -1
+
+
+# Rows of `table` with id > after (everything when None). The first full read
+# comes from the local Parquet snapshot when one is configured, topped up with
+# any rows added since it was last synced. `on_rows(n)` is called as rows arrive.
+def _load_since(table, after, on_rows=lambda n: None):
+    columns = CUSTOMER_COLUMNS[table]
+    frames = []
+    if after is None and SNAPSHOT_DIR:
+        from src.data import snapshot
+        sync_snapshot()
+        history = snapshot.read_frame(SNAPSHOT_DIR, table, columns)
+        if not history.empty:
+            frames.append(history)
+            on_rows(len(history))
+            after = int(history["id"].max())
+    for rows in iter_table_chunks(table, columns, after=after):
+        frames.append(to_frame(rows))
+        on_rows(len(rows))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns.split(","))
+
+
+def _order_users(order_ids):
+    frames = [pd.DataFrame(columns=["id", "user_id"])]
+    for i in range(0, len(order_ids), LOOKUP_BATCH):
+        batch = [int(x) for x in order_ids[i:i + LOOKUP_BATCH]]
+        frames.append(pd.DataFrame(get_client().table("orders").select("id,user_id").in_("id", batch).execute().data or []))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _utc_ns(ts):
+    return ts.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy().astype("datetime64[ns]").view(np.int64)
+
+
+# Ids as a nullable column, NO_FAVOURITE -> <NA>
+def _optional(ids):
+    column = pd.array(ids, dtype="Int64")
+    column[ids == NO_FAVOURITE] = pd.NA
+    return column
+
+
+# Sorted int64 keys with a count each. Adding a batch costs a binary search per
+# key plus one insert of the keys not seen before, not a rebuild.
+class _PairCounts:
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=np.int64)
+
+    def add(self, keys, values):
+        keys, inverse = np.unique(keys, return_inverse=True)
+        values = np.bincount(inverse, weights=values).astype(np.int64)
+        pos = np.searchsorted(self.keys, keys)
+        found = pos < len(self.keys)
+        found[found] = self.keys[pos[found]] == keys[found]
+        self.values[pos[found]] += values[found]
+        self.keys = np.insert(self.keys, pos[~found], keys[~found])
+        self.values = np.insert(self.values, pos[~found], values[~found])
+
+    # Value with the largest count for each of `codes` (sorted, unique); ties go to the smaller value
+    def top(self, codes):
+        lo = np.searchsorted(self.keys, codes << PAIR_BITS)
+        hi = np.searchsorted(self.keys, (codes + 1) << PAIR_BITS)
+        lengths = hi - lo
+        starts = np.cumsum(lengths) - lengths
+        rows = np.repeat(lo - starts, lengths) + np.arange(lengths.sum())
+        segment = np.repeat(np.arange(len(codes)), lengths)
+        order = np.lexsort((-self.values[rows], segment))
+        has = lengths > 0
+        best = rows[order[starts[has]]]
+        return codes[has], self.keys[best] & ((1 << PAIR_BITS) - 1)
+
+
+# Per-customer history, kept current by reading only the orders and items past
+# the last ids seen and merging their aggregates in.
+#   users: user_id -> dense integer code (append-only, so codes never move)
+#   per code: first/last order, orders, spend, favourite food and category
+#   foods / categories: quantity per (user, food) and (user, category)
+#   months: orders per (user, month), for cohort retention
+# One instance is shared by every session and refreshed at most once per TTL,
+# so a rerun costs nothing and a refresh costs O(new rows). The first build
+# reads the whole history (thousands of pages at scale without a snapshot), so
+# pages start it with build_in_background() and show `loaded` until `built`.
+class CustomerIndex:
+    def __init__(self):
+        self.watermarks = {"orders": None, "order_items": None}
+        self.users = pd.Index([], dtype=object)
+        self.first_order = np.empty(0, dtype=np.int64)
+        self.last_order = np.empty(0, dtype=np.int64)
+        self.orders = np.empty(0, dtype=np.int64)
+        self.spend = np.empty(0, dtype=np.float64)
+        self.favourite_food = np.empty(0, dtype=np.int64)
+        self.favourite_category = np.empty(0, dtype=np.int64)
+        self.foods = _PairCounts()
+        self.categories = _PairCounts()
+        self.months = _PairCounts()
+        self.refreshed_at = None
+        self.version = 0
+        # Rows read so far per table, for progress while building
+        self.loaded = {"orders": 0, "order_items": 0}
+        self.build_error = None
+        self._builder = None
+        self._build_lock = threading.Lock()
+        self._views = {}
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        return self.refreshed_at is not None
+
+    # Start the first build on a daemon thread unless built or already building;
+    # returns at once. A failed build is kept in build_error and retried on the next call.
+    def build_in_background(self, food_categories):
+        with self._build_lock:
+            if self.built or (self._builder is not None and self._builder.is_alive()):
+                return
+
+            def build():
+                try:
+                    self.refresh(food_categories)
+                except Exception as e:
+                    self.build_error = e
+
+            self.build_error = None
+            self._builder = threading.Thread(target=build, name="customer-index-build", daemon=True)
+            self._builder.start()
+
+    # Block until a background build started by build_in_background() finishes
+    def wait_built(self, timeout=None):
+        builder = self._builder
+        if builder is not None:
+            builder.join(timeout)
+        return self.built
+
+    # `food_categories` maps food id -> category id (for favourite categories)
+    def refresh(self, food_categories, max_age=CACHE_TTL_SECONDS):
+        with self._lock:
+            if self.refreshed_at is None or time.monotonic() - self.refreshed_at >= max_age:
+                self._apply(self._load("orders"), self._load("order_items"), food_categories)
+                self.refreshed_at = time.monotonic()
+        return self
+
+    def _load(self, table):
+        def on_rows(n):
+            self.loaded[table] += n
+        df = _load_since(table, self.watermarks[table], on_rows)
+        if not df.empty:
+            self.watermarks[table] = int(df["id"].max())
+        return df
+
+    # Codes for `user_ids`, assigning new ones to users not seen before
+    def _codes(self, user_ids):
+        user_ids = np.asarray(user_ids, dtype=object)
+        codes = self.users.get_indexer(user_ids)
+        new = pd.unique(user_ids[codes < 0])
+        if len(new):
+            n = len(new)
+            self.users = self.users.append(pd.Index(new, dtype=object))
+            self.first_order = np.append(self.first_order, np.full(n, np.iinfo(np.int64).max))
+            self.last_order = np.append(self.last_order, np.full(n, np.iinfo(np.int64).min))
+            self.orders = np.append(self.orders, np.zeros(n, dtype=np.int64))
+            self.spend = np.append(self.spend, np.zeros(n))
+            self.favourite_food = np.append(self.favourite_food, np.full(n, NO_FAVOURITE))
+            self.favourite_category = np.append(self.favourite_category, np.full(n, NO_FAVOURITE))
+            codes[codes < 0] = self.users.get_indexer(user_ids[codes < 0])
+        return codes.astype(np.int64)
+
+    def _apply(self, orders, items, food_categories):
+        orders = orders[orders["user_id"].notna()]
+        if orders.empty and items.empty:
+            return
+
+        # ---------- Order aggregates: one groupby over the new orders by user code ----------
+        order_users = pd.Series(dtype=np.int64)
+        if not orders.empty:
+            created = _utc_ns(orders["created_at"])
+            codes = self._codes(orders["user_id"].astype(str))
+            delta = pd.DataFrame({"code": codes, "created": created, "amount": orders["amount"].to_numpy(dtype=np.float64)})
+            delta = delta.groupby("code").agg(
+                first=("created", "min"), last=("created", "max"), orders=("created", "size"), spend=("amount", "sum")
+            )
+            c = delta.index.to_numpy()
+            self.first_order[c] = np.minimum(self.first_order[c], delta["first"].to_numpy())
+            self.last_order[c] = np.maximum(self.last_order[c], delta["last"].to_numpy())
+            self.orders[c] += delta["orders"].to_numpy()
+            self.spend[c] += delta["spend"].to_numpy()
+
+            months = created.astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+            self.months.add(codes << PAIR_BITS | months, np.ones(len(codes)))
+            order_users = pd.Series(codes, index=orders["id"].to_numpy())
+
+        # ---------- Item preferences ----------
+        if not items.empty:
+            missing = np.setdiff1d(items["order_id"].unique(), order_users.index.to_numpy())
+            if len(missing):
+                found = _order_users(missing).dropna(subset=["user_id"])
+                order_users = pd.concat([order_users, pd.Series(self._codes(found["user_id"].astype(str)), index=found["id"].to_numpy())])
+            codes = items["order_id"].map(order_users)
+            items = items.assign(code=codes, category_id=items["food_item_id"].map(food_categories)).dropna(subset=["code"])
+            codes = items["code"].to_numpy(dtype=np.int64)
+            quantity = items["quantity"].to_numpy(dtype=np.float64)
+            self.foods.add(codes << PAIR_BITS | items["food_item_id"].to_numpy(dtype=np.int64), quantity)
+            categorised = items["category_id"].notna().to_numpy()
+            self.categories.add(
+                codes[categorised] << PAIR_BITS | items["category_id"].to_numpy()[categorised].astype(np.int64),
+                quantity[categorised],
+            )
+
+            touched = np.unique(codes)
+            for counts, favourite in ((self.foods, self.favourite_food), (self.categories, self.favourite_category)):
+                users, values = counts.top(touched)
+                favourite[users] = values
+
+        self.version += 1
+        self._views = {}
+
+    # ---------- Views (built once per refresh) ----------
+
+    def _memo(self, name, build):
+        with self._lock:
+            key = (name, self.version)
+            if key not in self._views:
+                self._views[key] = build()
+            return self._views[key]
+
+    # One row per customer who has ordered, indexed by user_id, with recency,
+    # frequency and monetary scores from 1 (lowest fifth) to 5, by spend
+    def rfm(self):
+        def build():
+            ordered = self.orders > 0
+            df = pd.DataFrame({
+                "first_order": pd.to_datetime(self.first_order[ordered], utc=True),
+                "last_order": pd.to_datetime(self.last_order[ordered], utc=True),
+                "orders": self.orders[ordered],
+                "spend": self.spend[ordered],
+                "favourite_food_id": _optional(self.favourite_food[ordered]),
+                "favourite_category_id": _optional(self.favourite_category[ordered]),
+            }, index=pd.Index(self.users[ordered], name="user_id"))
+            if df.empty:
+                return df
+            df["avg_spend"] = df["spend"] / df["orders"]
+            df["recency_days"] = (pd.Timestamp.now(tz="UTC") - df["last_order"]).dt.days
+            for score, column, ascending in (("R", "recency_days", False), ("F", "orders", True), ("M", "spend", True)):
+                ranks = df[column].rank(method="first", ascending=ascending, pct=True)
+                df[score] = np.ceil(ranks * 5).clip(1, 5).astype(np.int8)
+            return df.sort_values("spend", ascending=False)
+        return self._memo("rfm", build)
+
+    # Share of each first-order-month cohort that ordered k months later (k = 0 is 100%),
+    # indexed by cohort month, with a leading `customers` column of cohort sizes
+    def retention(self):
+        def build():
+            if not len(self.months.keys):
+                return pd.DataFrame()
+            codes = self.months.keys >> PAIR_BITS
+            month = self.months.keys & ((1 << PAIR_BITS) - 1)
+            cohort = self.first_order[codes].astype("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+            active = pd.DataFrame({"cohort": cohort, "offset": month - cohort}).groupby(["cohort", "offset"]).size()
+            matrix = active.unstack("offset")
+            sizes = matrix[0]
+            matrix = matrix.div(sizes, axis=0)
+            matrix.insert(0, "customers", sizes.astype(np.int64))
+            matrix.index = pd.PeriodIndex.from_ordinals(matrix.index, freq="M")
+            return matrix
+        return self._memo("retention", build)
+
+
+customer_index = CustomerIndex()
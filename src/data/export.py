@@ -0,0 +1,167 @@
+import argparse
+import os
+import sys
+import tempfile
+import pandas as pd
+from src.data.catalog import fetch_catalog
+from src.data.repository import PAGE_SIZE, iter_table_chunks, table_columns, to_frame
+
+# Streaming export of order -> items -> add-ons rows joined with the menu.
+#
+# Orders created in [start, end) are read EXPORT_CHUNK_ORDERS at a time; each
+# chunk's items and add-ons are fetched by id, joined with the in-memory
+# catalog and written out before the next chunk is read, so memory stays
+# bounded by one chunk whatever the range. One row per add-on (or per item
+# without add-ons, or per order without items). Run from the repo root:
+#   python -m src.data.export --start 2025-06-01 --end 2025-07-01 --format parquet --out june.parquet
+
+EXPORT_CHUNK_ORDERS = int(os.getenv("EXPORT_CHUNK_ORDERS", str(PAGE_SIZE)))
+
+# Longest date range the dashboard's download button exports (0 = no limit).
+# Streamlit reads a download into memory and keeps it in its media store, so
+# larger dumps go through the CLI above.
+EXPORT_UI_MAX_DAYS = int(os.getenv("EXPORT_UI_MAX_DAYS", "92"))
+
+# Ids per `in` filter, keeping request URLs short
+IN_BATCH = 500
+
+# Output columns and their dtypes (nullable where a left join can leave gaps)
+EXPORT_DTYPES = {
+    "order_id": "int64",
+    "order_created_at": "datetime64[us, UTC]",
+    "user_id": "string",
+    "order_amount": "float64",
+    "order_item_id": "Int64",
+    "food_item_id": "Int64",
+    "food_name": "string",
+    "category_id": "Int64",
+    "category_name": "string",
+    "quantity": "Int64",
+    "item_price": "float64",
+    "addon_id": "Int64",
+    "addon_name": "string",
+}
+
+# Spooled downloads move from memory to a temporary file past this size
+SPOOL_BYTES = 32 * 2**20
+
+
+def _rows_in(table, column, ids):
+    columns = table_columns(table, "order_export")
+    frames = [pd.DataFrame(columns=columns.split(","))]
+    for i in range(0, len(ids), IN_BATCH):
+        batch = ids[i:i + IN_BATCH]
+        frames += [to_frame(rows) for rows in iter_table_chunks(table, columns, **{column: batch})]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _join(orders, items, addons, catalog):
+    foods = catalog["foods"].rename(columns={"id": "food_item_id", "name": "food_name"})
+    categories = catalog["categories"].rename(columns={"id": "category_id", "name": "category_name"})
+    addon_names = catalog["addons"].rename(columns={"id": "addon_id", "name": "addon_name"})
+
+    rows = orders.rename(columns={"id": "order_id", "created_at": "order_created_at", "amount": "order_amount"})
+    items = items.rename(columns={"id": "order_item_id", "price": "item_price"})
+    addons = addons.rename(columns={"id": "order_item_addon_id"})
+    rows = (
+        rows.merge(items, on="order_id", how="left")
+        .merge(addons, on="order_item_id", how="left")
+        .merge(foods[["food_item_id", "food_name", "category_id"]], on="food_item_id", how="left")
+        .merge(categories, on="category_id", how="left")
+        .merge(addon_names, on="addon_id", how="left")
+    )
+    return rows[list(EXPORT_DTYPES)].astype(EXPORT_DTYPES)
+
+
+# Orders created in [start, end), chunk_orders at a time. Requests stay at
+# PAGE_SIZE rows: a larger page comes back cut at PostgREST's max-rows and
+# would look like the last one, so chunks are built from several pages.
+def _order_chunks(start, end, chunk_orders):
+    pages, count = [], 0
+    for rows in iter_table_chunks(
+        "orders", table_columns("orders", "order_export"), page_size=min(chunk_orders, PAGE_SIZE), start=start, end=end
+    ):
+        pages.append(to_frame(rows))
+        count += len(rows)
+        if count >= chunk_orders:
+            yield pd.concat(pages, ignore_index=True)
+            pages, count = [], 0
+    if pages:
+        yield pd.concat(pages, ignore_index=True)
+
+
+# Joined rows for orders created in [start, end), one DataFrame per chunk of orders
+def iter_export(start=None, end=None, chunk_orders=EXPORT_CHUNK_ORDERS):
+    catalog = fetch_catalog()
+    for orders in _order_chunks(start, end, chunk_orders):
+        items = _rows_in("order_items", "order_id", orders["id"].tolist())
+        addons = _rows_in("order_item_addons", "order_item_id", items["id"].tolist())
+        yield _join(orders, items, addons, catalog)
+
+
+def _write_csv(chunks, out):
+    rows = 0
+    for i, df in enumerate(chunks):
+        out.write(df.to_csv(index=False, header=i == 0).encode())
+        rows += len(df)
+    if not rows:
+        out.write(",".join(EXPORT_DTYPES).encode() + b"\n")
+    return rows
+
+
+# One row group per chunk; the schema is fixed up front so every chunk matches
+def _write_parquet(chunks, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(pd.DataFrame(columns=list(EXPORT_DTYPES)).astype(EXPORT_DTYPES), preserve_index=False)
+    rows = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for df in chunks:
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+            rows += len(df)
+    return rows
+
+
+FORMATS = {"csv": _write_csv, "parquet": _write_parquet}
+MIME_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+# Stream the export for [start, end) into the binary file `out`; returns the rows written
+def export(out, start=None, end=None, fmt="csv", chunk_orders=EXPORT_CHUNK_ORDERS):
+    return FORMATS[fmt](iter_export(start, end, chunk_orders), out)
+
+
+# The export as a file object positioned at its start, kept in memory while
+# small and spilled to a temporary file beyond SPOOL_BYTES. st.download_button
+# still reads the whole file into memory, so the UI caps the range (EXPORT_UI_MAX_DAYS).
+def export_file(start=None, end=None, fmt="csv"):
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    export(out, start, end, fmt)
+    out.seek(0)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export joined order, item and add-on rows for a date range.")
+    parser.add_argument("--start", help="first day (UTC, inclusive), e.g. 2025-06-01")
+    parser.add_argument("--end", help="last day (UTC, exclusive), e.g. 2025-07-01")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    parser.add_argument("--out", required=True, help="output file, or - for CSV on stdout")
+    parser.add_argument("--chunk-orders", type=int, default=EXPORT_CHUNK_ORDERS)
+    args = parser.parse_args()
+
+    start = pd.Timestamp(args.start, tz="UTC") if args.start else None
+    end = pd.Timestamp(args.end, tz="UTC") if args.end else None
+    if args.out == "-":
+        if args.format != "csv":
+            parser.error("only CSV can be written to stdout")
+        rows = export(sys.stdout.buffer, start, end, args.format, args.chunk_orders)
+    else:
+        with open(args.out, "wb") as out:
+            rows = export(out, start, end, args.format, args.chunk_orders)
+    print(f"{rows:,} rows exported", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Shared preprocessing for every frame the analytics widgets read: compact
+# dtypes plus the derived time columns, computed once when a frame is built
+# (and cached with it). Widgets treat the results as read-only.
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Orders from DAY_START_HOUR up to (not including) NIGHT_START_HOUR count as "Day"
+DAY_START_HOUR = 6
+NIGHT_START_HOUR = 18
+
+
+# "Breakfast:6,Lunch:11" -> [("Breakfast", 6), ("Lunch", 11)], sorted by start hour
+def parse_shifts(spec):
+    shifts = []
+    for part in spec.split(","):
+        label, _, start = part.rpartition(":")
+        shifts.append((label.strip(), int(start)))
+    return sorted(shifts, key=lambda shift: shift[1])
+
+
+# Named service shifts as (label, start hour). Each runs until the next one starts;
+# the last wraps past midnight. Override with e.g. SHIFT_BOUNDARIES="Lunch:11,Dinner:18".
+SHIFTS = parse_shifts(os.getenv("SHIFT_BOUNDARIES", "Breakfast:6,Lunch:11,Dinner:17,Late Night:22"))
+
+ID_COLUMNS = ("id", "order_id", "order_item_id", "food_item_id", "food_id", "addon_id", "category_id")
+COUNT_COLUMNS = ("quantity", "orders", "addons", "hour")
+AMOUNT_COLUMNS = ("amount", "price")
+LABEL_COLUMNS = ("user_id", "status")
+
+
+# int32 ids and counts, categorical repeated labels. Amounts stay float64:
+# float32 keeps about 7 digits, so currency sums over many rows would drift.
+# Menu names stay plain strings: they are few, and categoricals would make
+# groupby("name") emit every unused name.
+# Non-numeric ids (e.g. uuids) become categoricals instead.
+def compact(df):
+    dtypes = {}
+    for column in df.columns:
+        series = df[column]
+        if column in ID_COLUMNS or column in COUNT_COLUMNS:
+            if pd.api.types.is_numeric_dtype(series) and not series.isna().any():
+                dtypes[column] = "int32"
+            elif not pd.api.types.is_numeric_dtype(series):
+                dtypes[column] = "category"
+        elif column in AMOUNT_COLUMNS and pd.api.types.is_numeric_dtype(series):
+            dtypes[column] = "float64"
+        elif column in LABEL_COLUMNS:
+            dtypes[column] = "category"
+    return df.astype(dtypes)
+
+
+# "Day"/"Night" label for each hour, as a categorical (one comparison per row, no Python callback)
+def day_period(hours):
+    is_day = (hours >= DAY_START_HOUR) & (hours < NIGHT_START_HOUR)
+    return pd.Categorical.from_codes(np.where(is_day, 0, 1), categories=["Day", "Night"])
+
+
+# Shift label for each hour, as an ordered categorical: a binary search of the hour
+# in the shift start hours; hours before the first start belong to the wrapping last shift
+def shift_of(hours, shifts=None):
+    shifts = shifts or SHIFTS
+    starts = np.array([start for _, start in shifts])
+    codes = np.searchsorted(starts, np.asarray(hours), side="right") - 1
+    codes[codes < 0] = len(shifts) - 1
+    return pd.Categorical.from_codes(codes, categories=[label for label, _ in shifts], ordered=True)
+
+
+# Add date, month, weekday, hour, period and shift derived from `column`.
+# Timestamps are bucketed in UTC, matching the server-side rollup. Day-level
+# frames (a `day` column and no `hour`) get no hour, period or shift.
+def add_time_columns(df, column="created_at"):
+    ts = df[column]
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    derived = {}
+    if column != "day":
+        derived["date"] = ts.dt.normalize()
+    derived["month"] = ts.dt.to_period("M")
+    derived["weekday"] = pd.Categorical.from_codes(ts.dt.dayofweek.to_numpy(), categories=WEEKDAYS, ordered=True)
+    if column == "day" and "hour" not in df:
+        return df.assign(**derived)
+    hours = df["hour"] if "hour" in df else ts.dt.hour.astype("int8")
+    derived["hour"] = hours
+    derived["period"] = day_period(hours.to_numpy())
+    derived["shift"] = shift_of(hours.to_numpy())
+    return df.assign(**derived)
+
+
+# Typed frame of an order table. Frames with created_at are sorted by it,
+# oldest first, and get the derived time columns.
+def prepare_frame(df):
+    if df.empty:
+        return df
+    df = compact(df)
+    if "created_at" in df:
+        if not df["created_at"].is_monotonic_increasing:
+            df = df.sort_values("created_at", kind="stable", ignore_index=True)
+        df = add_time_columns(df)
+    return df
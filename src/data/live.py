@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from src.supabase_client import get_client
+from src.data.frames import WEEKDAYS
+from src.data.repository import ORDER_TABLES, invalidate, iter_table_chunks, table_columns, to_frame
+from src.data.rollups import fetch_cube
+
+# Seconds between polls for new orders while the live view is open
+LIVE_REFRESH_SECONDS = int(os.getenv("LIVE_REFRESH_SECONDS", "10"))
+
+# Columns each delta needs (declared in WIDGET_COLUMNS); everything else stays on the server
+LIVE_COLUMNS = {table: table_columns(table, "live_dashboard") for table in ORDER_TABLES}
+
+
+def _latest_id(table):
+    rows = get_client().table(table).select("id").order("id", desc=True).limit(1).execute().data
+    return rows[0]["id"] if rows else 0
+
+
+# Running aggregates for the live view, advanced by polling each order table
+# for rows past its id watermark, so a refresh costs O(new rows).
+#   today: orders, revenue, add-ons and quantity per food (UTC day)
+#   heatmap: orders per weekday x hour over all history, seeded from the rollup
+# One instance is shared by every session; concurrent refreshes poll once.
+class LiveAggregates:
+    def __init__(self):
+        self.watermarks = None
+        self.today = None
+        self.first_item_today = None
+        self.orders = 0
+        self.revenue = 0.0
+        self.addons = 0
+        self.food_quantity = {}
+        self.heatmap = np.zeros((7, 24), dtype=np.int64)
+        self.polled_at = None
+        self.updated_at = None
+        self._lock = threading.Lock()
+
+    def _reset_day(self, today):
+        self.today = today
+        self.first_item_today = None
+        self.orders = 0
+        self.revenue = 0.0
+        self.addons = 0
+        self.food_quantity = {}
+
+    # Seed from data read after the watermarks are taken, so every row counts
+    # once: ids up to a watermark here, ids past it in the polls. Add-ons hang
+    # off items, so theirs is taken first and covers add-ons of later items.
+    def _bootstrap(self):
+        today = pd.Timestamp.now(tz="UTC").normalize()
+        self._reset_day(today)
+        self.watermarks = {table: _latest_id(table) for table in ("order_item_addons", "order_items", "orders")}
+
+        # Days before today from the shared cube, reloaded now: a cached one may be
+        # CACHE_TTL_SECONDS old and miss orders placed before the watermarks.
+        # The reload replaces the cube every other section reads, so it is not repeated.
+        invalidate("order_rollup")
+        cube_orders = fetch_cube()["orders"]
+        history = cube_orders[cube_orders["day"] < today.tz_localize(None)]
+        self.heatmap[:] = 0
+        if not history.empty:
+            np.add.at(
+                self.heatmap,
+                (history["day"].dt.weekday.to_numpy(), history["hour"].to_numpy(dtype=np.int64)),
+                history["orders"].to_numpy(dtype=np.int64),
+            )
+
+        for table in ("orders", "order_items"):
+            for rows in iter_table_chunks(table, LIVE_COLUMNS[table], start=today):
+                df = to_frame(rows)
+                self._apply(table, df[df["id"] <= self.watermarks[table]])
+                if rows[-1]["id"] >= self.watermarks[table]:
+                    break
+        # Today's add-ons hang off today's items, whose ids start at first_item_today
+        if self.first_item_today is not None:
+            first = (
+                get_client().table("order_item_addons").select("id")
+                .gte("order_item_id", self.first_item_today).order("id").limit(1).execute().data
+            )
+            if first:
+                self.watermarks["order_item_addons"] = first[0]["id"] - 1
+        self._poll("order_item_addons")
+
+    def _apply(self, table, df):
+        if df.empty:
+            return
+        if table == "order_item_addons":
+            if self.first_item_today is not None:
+                self.addons += int((df["order_item_id"] >= self.first_item_today).sum())
+            return
+
+        created = df["created_at"]
+        today = created >= self.today
+        if table == "orders":
+            np.add.at(self.heatmap, (created.dt.weekday.to_numpy(), created.dt.hour.to_numpy()), 1)
+            self.orders += int(today.sum())
+            self.revenue += float(df.loc[today, "amount"].sum())
+        else:
+            items = df[today]
+            if not items.empty and self.first_item_today is None:
+                self.first_item_today = int(items["id"].iloc[0])
+            for food_id, quantity in items.groupby("food_item_id")["quantity"].sum().items():
+                self.food_quantity[food_id] = self.food_quantity.get(food_id, 0) + int(quantity)
+
+    def _poll(self, table):
+        for rows in iter_table_chunks(table, LIVE_COLUMNS[table], after=self.watermarks[table]):
+            self._apply(table, to_frame(rows))
+            self.watermarks[table] = rows[-1]["id"]
+
+    # Fetch and apply rows added since the last poll; at most one poll per
+    # `min_interval` seconds across all sessions (the others wait and reuse it)
+    def refresh(self, min_interval=LIVE_REFRESH_SECONDS / 2):
+        with self._lock:
+            if self.polled_at is None or time.monotonic() - self.polled_at >= min_interval:
+                if self.watermarks is None:
+                    self._bootstrap()
+                else:
+                    today = pd.Timestamp.now(tz="UTC").normalize()
+                    if today != self.today:
+                        self._reset_day(today)
+                    for table in ("orders", "order_items", "order_item_addons"):
+                        self._poll(table)
+                self.polled_at = time.monotonic()
+                self.updated_at = pd.Timestamp.now(tz="UTC")
+            return self._snapshot()
+
+    # ---------- Views ----------
+
+    # Plain copies for rendering while other sessions may be polling
+    def _snapshot(self):
+        return {
+            "updated_at": self.updated_at,
+            "orders": self.orders,
+            "revenue": self.revenue,
+            "addons": self.addons,
+            "heatmap": self._heatmap_frame(),
+            "top_foods": self._top_foods(),
+        }
+
+    def _heatmap_frame(self):
+        weekday, hour = np.indices(self.heatmap.shape)
+        return pd.DataFrame({
+            "weekday": np.asarray(WEEKDAYS)[weekday.ravel()],
+            "hour": hour.ravel(),
+            "orders": self.heatmap.ravel(),
+        })
+
+    def _top_foods(self, limit=10):
+        ranked = sorted(self.food_quantity.items(), key=lambda item: -item[1])[:limit]
+        return pd.DataFrame(ranked, columns=["food_item_id", "quantity"])
+
+
+live = LiveAggregates()
@@ -0,0 +1,38 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+# Upper bound on requests in flight for a single fetch_concurrently call
+FETCH_WORKERS = 6
+
+# Seconds each request may take, counted from when the batch starts
+FETCH_TIMEOUT_SECONDS = 30
+
+
+class FetchError(RuntimeError):
+    def __init__(self, name, message):
+        super().__init__(f"Fetching '{name}' {message}")
+        self.name = name
+
+
+# Run independent loaders ({name: callable}) on a bounded thread pool and return
+# {name: result}. Wall time is roughly the slowest loader instead of the sum.
+# The first failure or timeout raises FetchError naming the loader.
+def fetch_concurrently(loaders, timeout=FETCH_TIMEOUT_SECONDS, workers=FETCH_WORKERS):
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(loaders))), thread_name_prefix="fetch")
+    try:
+        # Each loader runs in a copy of the caller's context so per-rerun metrics follow it
+        futures = {name: executor.submit(contextvars.copy_context().run, load) for name, load in loaders.items()}
+        deadline = time.monotonic() + timeout
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FuturesTimeout:
+                raise FetchError(name, f"timed out after {timeout}s") from None
+            except Exception as e:
+                raise FetchError(name, f"failed: {e}") from e
+        return results
+    finally:
+        # Don't block the page on stragglers after a failure
+        executor.shutdown(wait=False, cancel_futures=True)
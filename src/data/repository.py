@@ -0,0 +1,276 @@
+import os
+import pandas as pd
+from src.supabase_client import get_client
+from src.data.cache import SharedCache
+from src.data.frames import prepare_frame
+
+# When set, order tables are read from a local Parquet snapshot (see src/data/snapshot.py)
+# that is topped up incrementally instead of being downloaded from Supabase
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR")
+
+# Seconds a fetched table stays fresh before the next read goes back to Supabase
+CACHE_TTL_SECONDS = 300
+
+# Rows per request when paging through the order tables; keep at or below PostgREST's max-rows
+PAGE_SIZE = 1000
+
+# Append-only order history; these are the tables paged, range-filtered and snapshotted
+ORDER_TABLES = ("orders", "order_items", "order_item_addons")
+
+# Columns parsed as each page arrives: timestamps to tz-aware UTC, plain dates to naive datetime64
+TIMESTAMP_COLUMNS = ("created_at",)
+DATE_COLUMNS = ("day",)
+
+# Columns each consumer reads from the order tables. Shared loads (fetch_frame,
+# the snapshot) select only the union per table, so wide columns such as
+# addresses and statuses are never transferred; pollers select their own slice.
+WIDGET_COLUMNS = {
+    "daily_insights": {"orders": ("id", "user_id", "amount", "created_at")},
+    "unique_users": {"orders": ("user_id", "created_at")},
+    "live_dashboard": {
+        "orders": ("id", "amount", "created_at"),
+        "order_items": ("id", "food_item_id", "quantity", "created_at"),
+        "order_item_addons": ("id", "order_item_id"),
+    },
+    "customer_insights": {
+        "orders": ("id", "user_id", "amount", "created_at"),
+        "order_items": ("id", "order_id", "food_item_id", "quantity"),
+    },
+    "order_export": {
+        "orders": ("id", "user_id", "amount", "created_at"),
+        "order_items": ("id", "order_id", "food_item_id", "quantity", "price"),
+        "order_item_addons": ("id", "order_item_id", "addon_id"),
+    },
+}
+
+# Tables each server-side aggregate (see sql/analytics_functions.sql) reads,
+# so invalidating a table also drops the aggregates computed from it
+RPC_SOURCES = {
+    "order_totals": ("orders", "order_items"),
+    "order_rollup": ("orders", "order_items", "order_item_addons", "foods"),
+    "user_sketches": ("orders",),
+}
+
+# (table or rpc, columns, filters) -> value, shared by every session in the process
+_shared = SharedCache(CACHE_TTL_SECONDS)
+
+
+# Value of `key` from the shared cache, loading it with `load()` on a miss
+def cached(key, load):
+    return _shared.get(key, load)
+
+
+def cache_stats():
+    return _shared.stats()
+
+
+# Drop every cached entry of the given tables (all tables when called without arguments)
+def invalidate(*tables):
+    if not tables:
+        _shared.invalidate()
+        return
+    names = set(tables)
+    names.update(rpc for rpc, sources in RPC_SOURCES.items() if names & set(sources))
+    _shared.invalidate(names)
+
+
+# ---------- Column projection ----------
+
+# "id,..." for a select(): the columns of `table` declared by `widgets` (all
+# widgets when none are given), id first as the paging key; "*" if none declared
+def table_columns(table, *widgets):
+    columns = {}
+    for widget in widgets or WIDGET_COLUMNS:
+        for column in WIDGET_COLUMNS[widget].get(table, ()):
+            columns[column] = True
+    if not columns:
+        return "*"
+    return ",".join(["id"] + [c for c in columns if c != "id"])
+
+
+# ---------- Paginated loading ----------
+
+# ISO 8601 text of a timestamp for filters and RPC parameters (None stays None)
+def to_iso(ts):
+    return None if ts is None else pd.Timestamp(ts).isoformat()
+
+
+# Restrict a query to start <= created_at < end; either bound may be None
+def _in_range(query, start, end):
+    if start is not None:
+        query = query.gte("created_at", to_iso(start))
+    if end is not None:
+        query = query.lt("created_at", to_iso(end))
+    return query
+
+
+# Yield the table in pages of `page_size` rows, ordered by `key` and resumed
+# from the last key seen (or from `after`), so no single response hits the server's row cap.
+# Keyword arguments filter a column to a list of values, e.g. order_id=[1, 2, 3].
+def iter_table_chunks(table, columns="*", key="id", page_size=PAGE_SIZE, start=None, end=None, after=None, **isin):
+    last_key = after
+    while True:
+        query = _in_range(get_client().table(table).select(columns), start, end)
+        for column, values in isin.items():
+            query = query.in_(column, [int(v) for v in values])
+        query = query.order(key)
+        if last_key is not None:
+            query = query.gt(key, last_key)
+        rows = query.limit(page_size).execute().data or []
+        if not rows:
+            return
+
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_key = rows[-1][key]
+
+
+# DataFrame of PostgREST rows with created_at as tz-aware UTC and day as datetime64
+def to_frame(rows):
+    df = pd.DataFrame(rows)
+    for column in TIMESTAMP_COLUMNS:
+        if column in df:
+            df[column] = pd.to_datetime(df[column], format="ISO8601", utc=True)
+    for column in DATE_COLUMNS:
+        if column in df:
+            df[column] = pd.to_datetime(df[column], format="ISO8601")
+    return df
+
+
+# Build a typed DataFrame page by page; only one page of raw JSON is alive at a time
+def load_frame(table, columns="*", key="id", page_size=PAGE_SIZE, start=None, end=None):
+    chunks = [to_frame(rows) for rows in iter_table_chunks(table, columns, key, page_size, start, end)]
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True)
+
+
+# Bring the local snapshot up to date at most once per cache period
+def sync_snapshot():
+    from src.data import snapshot
+    return cached(("snapshot", "sync", ()), lambda: snapshot.sync(SNAPSHOT_DIR))
+
+
+# Cached, preprocessed (see src/data/frames.py) variant of load_frame, optionally
+# limited to a created_at range; treat the result as read-only. By default only
+# the declared columns are read, so every widget shares one entry per range.
+def fetch_frame(table, columns=None, key="id", start=None, end=None):
+    columns = columns or table_columns(table)
+
+    def load():
+        if SNAPSHOT_DIR and table in ORDER_TABLES:
+            from src.data import snapshot
+            sync_snapshot()
+            return prepare_frame(snapshot.read_frame(SNAPSHOT_DIR, table, columns, start, end))
+        return prepare_frame(load_frame(table, columns, key, start=start, end=end))
+
+    return cached((table, columns, ("frame", key, to_iso(start), to_iso(end))), load)
+
+
+# ---------- Server-side aggregates ----------
+
+# PostgREST caps function results at its max-rows setting too. Offset paging
+# would re-run the whole aggregate for every page, so larger results are read
+# a window of days at a time instead: each call passes the window as the
+# function's own [start_ts, end_ts), Postgres aggregates only that window
+# (through the created_at indexes), and the next window starts at the last day
+# returned, a keyset on the leading `day` column. Rows are ordered by these
+# (unique together) columns so a window's days arrive whole and in order.
+RPC_ORDER = {
+    "order_rollup": ("day", "hour", "food_item_id", "category_id", "addon_id"),
+    "user_sketches": ("day",),
+}
+
+# Share of a page each window aims to fill, given the rows per day seen so far
+WINDOW_FILL = 0.8
+
+DAY = pd.Timedelta(days=1)
+
+
+def _utc(ts):
+    if ts is None:
+        return None
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tz is None else ts
+
+
+def _rpc_page(name, params, start, end, offset=0, page_size=PAGE_SIZE):
+    # The functions are STABLE, so they are called as read-only GETs (which the
+    # transport may retry); unset bounds fall back to the SQL defaults
+    params = {k: v for k, v in {**params, "start_ts": to_iso(start), "end_ts": to_iso(end)}.items() if v is not None}
+    query = get_client().rpc(name, params, get=True)
+    for column in RPC_ORDER.get(name, ()):
+        query = query.order(column, nullsfirst=True)
+    return query.range(offset, offset + page_size - 1).execute().data or []
+
+
+# All rows of [start, end) by offset: for unordered results, and for a day that fills a page on its own
+def _rpc_offset_rows(name, params, start, end, page_size):
+    rows = []
+    while True:
+        page = _rpc_page(name, params, start, end, len(rows), page_size)
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+
+
+# Every row of a function call (params: start_ts/end_ts), uncached
+def rpc_rows(name, params, page_size=PAGE_SIZE):
+    start, end = _utc(params.get("start_ts")), _utc(params.get("end_ts"))
+    if name not in RPC_ORDER:
+        return _rpc_offset_rows(name, params, start, end, page_size)
+
+    # The first call covers the whole range; most results fit in one page
+    rows, upper, window = [], end, None
+    while True:
+        page = _rpc_page(name, params, start, upper, page_size=page_size)
+        if len(page) < page_size:
+            rows.extend(page)
+            if upper == end:
+                return rows
+            if page:
+                # Resize the window from the rows per day just seen, at most doubling it
+                window = min(2 * window, _window(len(page) / (window / DAY), page_size))
+            else:
+                # Nothing in the window: double it, or read an open-ended rest in one call
+                window = 2 * window if end is not None else None
+            start = upper
+        else:
+            # Days before the page's last day are complete; resume from that day
+            last = page[-1]["day"]
+            last_day = _utc(last)
+            resume = last_day if start is None else max(start, last_day)
+            done = [r for r in page if r["day"] < last]
+            if done:
+                rows.extend(done)
+                window = _window(len(done) / ((last_day - _utc(done[0]["day"])) / DAY), page_size)
+                start = resume
+            else:
+                # One day fills a page by itself: page through just that day
+                day_end = last_day + DAY if end is None else min(end, last_day + DAY)
+                rows.extend(_rpc_offset_rows(name, params, resume, day_end, page_size))
+                if day_end == end:
+                    return rows
+                window, start = DAY, day_end
+        upper = None if window is None else start + window
+        if upper is None or (end is not None and upper >= end):
+            upper = end
+        elif end is None and upper > pd.Timestamp.now(tz="UTC"):
+            upper = None
+
+
+# Whole days that should hold about WINDOW_FILL of a page at `per_day` rows per day
+def _window(per_day, page_size):
+    return DAY * max(1, int(WINDOW_FILL * page_size / max(per_day, 1)))
+
+
+# Call one of the Postgres functions in sql/analytics_functions.sql for orders
+# created in [start, end); either bound may be None for an open range
+def fetch_rpc(name, start=None, end=None):
+    params = {"start_ts": to_iso(start), "end_ts": to_iso(end)}
+    return cached(
+        (name, "rpc", tuple(sorted(params.items()))),
+        lambda: to_frame(rpc_rows(name, params)),
+    )
+
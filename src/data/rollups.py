@@ -0,0 +1,109 @@
+import pandas as pd
+from src.data.frames import add_time_columns, compact
+from src.data.repository import cached, fetch_rpc
+from src.data.time_index import TimeIndex
+
+# Rollup cube built once per data refresh by order_rollup() (sql/analytics_functions.sql)
+# and split into its three grains. Widgets slice these frames instead of raw rows:
+#   "orders": day, hour                      -> orders, revenue
+#   "foods":  day, food_item_id, category_id -> quantity, addons
+#   "addons": day, addon_id                  -> addons
+# The third entry is the column that is only filled in on that grain's rows.
+# Menu grains are per day: the widgets only read them by day and month.
+# Every grain also carries month and weekday (plus period and shift where it
+# has an hour), is sorted by its keys, and has a TimeIndex under cube["index"][grain].
+CUBE_GRAINS = {
+    "orders": (["day", "hour"], ["orders", "revenue"], "orders"),
+    "foods": (["day", "food_item_id", "category_id"], ["quantity", "addons"], "food_item_id"),
+    "addons": (["day", "addon_id"], ["addons"], "addon_id"),
+}
+
+
+def _split_cube(rows):
+    cube = {}
+    for grain, (keys, measures, marker) in CUBE_GRAINS.items():
+        if rows.empty:
+            part = pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "day" else "float64") for c in keys + measures})
+        else:
+            part = rows.loc[rows[marker].notna(), keys + measures]
+        # Columns that are NULL on every row arrive as object; make all keys/measures numeric first
+        part = part.astype({c: "float64" for c in keys + measures if c != "day"})
+        part = compact(part).sort_values(keys, kind="stable")
+        cube[grain] = add_time_columns(part, "day").reset_index(drop=True)
+    cube["index"] = {grain: TimeIndex(cube[grain]["day"]) for grain in CUBE_GRAINS}
+    cube["monthly"] = _build_monthly(cube)
+    return cube
+
+
+# Every per-month result the widgets show, for all months in one pass over the
+# cube, so switching months (or charting a trend) is a lookup:
+#   "summary":       month -> orders, revenue, day_revenue, night_revenue, top_food_id, top_food_quantity
+#   "foods":         month, food_item_id, category_id -> quantity
+#   "categories":    month, category_id -> quantity, percent
+#   "addons":        month, addon_id -> addons
+#   "weekday_hours": month, weekday, hour -> orders, revenue
+#   "shifts":        month, shift -> orders, revenue
+def _build_monthly(cube):
+    orders, foods = cube["orders"], cube["foods"]
+
+    summary = orders.groupby("month")[["orders", "revenue"]].sum()
+    split = orders.pivot_table(index="month", columns="period", values="revenue", aggfunc="sum", observed=False, fill_value=0)
+    summary["day_revenue"] = split.get("Day", 0)
+    summary["night_revenue"] = split.get("Night", 0)
+
+    food_totals = foods.groupby(["month", "food_item_id", "category_id"], observed=True)["quantity"].sum().reset_index()
+    top = food_totals.sort_values("quantity", ascending=False, kind="stable").drop_duplicates("month").set_index("month")
+    summary["top_food_id"] = top["food_item_id"]
+    summary["top_food_quantity"] = top["quantity"]
+
+    categories = food_totals.groupby(["month", "category_id"])["quantity"].sum().reset_index()
+    categories["percent"] = categories["quantity"] / categories.groupby("month")["quantity"].transform("sum") * 100
+
+    return {
+        "summary": summary.sort_index(),
+        "foods": food_totals,
+        "categories": categories,
+        "addons": cube["addons"].groupby(["month", "addon_id"])["addons"].sum().reset_index(),
+        "weekday_hours": orders.groupby(["month", "weekday", "hour"], observed=True)[["orders", "revenue"]].sum().reset_index(),
+        "shifts": orders.groupby(["month", "shift"], observed=True)[["orders", "revenue"]].sum().reset_index(),
+    }
+
+
+# Rows of a cube["monthly"] table for one month
+def month_rows(table, month):
+    return table[table["month"] == month]
+
+
+# Full-history cube, cached alongside (and invalidated with) the order_rollup rows
+def fetch_cube():
+    return cached(("order_rollup", "cube", ()), lambda: _split_cube(fetch_rpc("order_rollup")))
+
+
+# Rows of one grain for a month (pandas Period), as a positional slice
+def slice_month(cube, grain, month):
+    return cube[grain].iloc[cube["index"][grain].month(month)]
+
+
+# Rows of one grain for a calendar day, as a positional slice
+def slice_day(cube, grain, date):
+    return cube[grain].iloc[cube["index"][grain].day(date)]
+
+
+# Months that have at least one order, newest first (as pandas Periods)
+def order_months(cube):
+    return [pd.Period(m, freq="M") for m in cube["index"]["orders"].months[::-1]]
+
+
+# Days that have at least one order, newest first (as datetime.date)
+def order_dates(cube):
+    return [pd.Timestamp(d).date() for d in cube["index"]["orders"].days[::-1]]
+
+
+# Times each add-on name was chosen in a slice of the "addons" grain. Counts are
+# summed per integer addon_id first, then labelled, so the cost follows the slice.
+def addon_usage(addon_rows, addon_defs, limit=None):
+    counts = addon_rows.groupby("addon_id")["addons"].sum()
+    names = addon_defs.set_index("id")["name"].reindex(counts.index)
+    usage = pd.DataFrame({"name": names.to_numpy(), "count": counts.to_numpy()}).dropna(subset=["name"])
+    usage = usage.groupby("name")["count"].sum().reset_index().sort_values(by="count", ascending=False)
+    return usage.head(limit) if limit else usage
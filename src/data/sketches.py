@@ -0,0 +1,117 @@
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+from src.data.repository import cached, fetch_frame, fetch_rpc
+
+# Per-day HyperLogLog sketches of orders.user_id.
+#
+# user_sketches() in sql/analytics_functions.sql returns one row per day with
+# 2^SKETCH_PRECISION registers (hex, one byte each). Sketches merge with an
+# elementwise max, so unique users for any set of days cost one pass over
+# those days' registers, with a standard error of about 1.04 / sqrt(REGISTERS).
+# Hashing here matches the SQL exactly: the first 8 bytes of md5(user_id) as a
+# signed bigint; low bits pick the register, the next 51 bits give the rank.
+
+SKETCH_PRECISION = 12
+REGISTERS = 1 << SKETCH_PRECISION
+RANK_BITS = 51
+
+# Ranges up to this many days are counted exactly from the raw orders instead
+EXACT_MAX_DAYS = int(os.getenv("UNIQUE_USERS_EXACT_DAYS", "7"))
+
+
+def hash_users(user_ids):
+    unique, inverse = np.unique(np.asarray(user_ids, dtype=str), return_inverse=True)
+    hashes = np.array(
+        [int.from_bytes(hashlib.md5(u.encode()).digest()[:8], "big", signed=True) for u in unique],
+        dtype=np.int64,
+    )
+    return hashes[inverse]
+
+
+# (register, rank) for each hashed value
+def _registers(hashes):
+    register = (hashes & (REGISTERS - 1)).astype(np.int64)
+    w = (hashes >> SKETCH_PRECISION) & ((1 << RANK_BITS) - 1)
+    # frexp's exponent is the bit length (exact: w < 2**53); 0 gives the maximum rank
+    rank = RANK_BITS + 1 - np.frexp(w.astype(np.float64))[1]
+    return register, rank.astype(np.uint8)
+
+
+# Same rows as the SQL function, from an orders frame (for the offline stand-in and benchmarks)
+def sketch_rows(orders):
+    orders = orders[orders["user_id"].notna()]
+    if orders.empty:
+        return pd.DataFrame(columns=["day", "registers"])
+    days = orders["created_at"].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy().astype("datetime64[D]")
+    day_values, day_idx = np.unique(days, return_inverse=True)
+    register, rank = _registers(hash_users(orders["user_id"].to_numpy()))
+    dense = np.zeros((len(day_values), REGISTERS), dtype=np.uint8)
+    np.maximum.at(dense, (day_idx, register), rank)
+    return pd.DataFrame({"day": day_values.astype(str), "registers": [row.tobytes().hex() for row in dense]})
+
+
+def estimate(registers):
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    # Linear counting is more accurate while many registers are still empty
+    if raw <= 2.5 * m and zeros:
+        return m * np.log(m / zeros)
+    return raw
+
+
+class DailySketches:
+    def __init__(self, rows):
+        if len(rows):
+            rows = rows.sort_values("day")
+            self.days = pd.to_datetime(rows["day"]).to_numpy().astype("datetime64[D]")
+            hex_registers = "".join(rows["registers"])
+            self.registers = np.frombuffer(bytes.fromhex(hex_registers), dtype=np.uint8).reshape(-1, REGISTERS)
+        else:
+            self.days = np.array([], dtype="datetime64[D]")
+            self.registers = np.zeros((0, REGISTERS), dtype=np.uint8)
+
+    # Merged registers of the days in [start, end), optionally only one weekday (0 = Monday)
+    def merge(self, start=None, end=None, weekday=None):
+        lo = 0 if start is None else self.days.searchsorted(np.datetime64(pd.Timestamp(start).date(), "D"))
+        hi = len(self.days) if end is None else self.days.searchsorted(np.datetime64(pd.Timestamp(end).date(), "D"))
+        registers = self.registers[lo:hi]
+        if weekday is not None:
+            # 1970-01-01 was a Thursday
+            registers = registers[(self.days[lo:hi].astype(np.int64) + 3) % 7 == weekday]
+        if not len(registers):
+            return np.zeros(REGISTERS, dtype=np.uint8)
+        return registers.max(axis=0)
+
+    def unique(self, start=None, end=None, weekday=None):
+        registers = self.merge(start, end, weekday)
+        return 0 if not registers.any() else int(round(estimate(registers)))
+
+
+def fetch_user_sketches():
+    return cached(("user_sketches", "sketches", ()), lambda: DailySketches(fetch_rpc("user_sketches")))
+
+
+# True when unique_users counts [start, end) exactly rather than from sketches
+def counts_exactly(start, end):
+    return start is not None and end is not None and (pd.Timestamp(end) - pd.Timestamp(start)).days <= EXACT_MAX_DAYS
+
+
+# Distinct users who ordered in [start, end) (day-aligned), optionally on one weekday.
+# Short ranges are exact; anything else merges the daily sketches (`sketches`
+# when the caller already loaded them).
+def unique_users(start=None, end=None, weekday=None, exact=None, sketches=None):
+    if exact is None:
+        exact = counts_exactly(start, end)
+    if not exact:
+        return (sketches or fetch_user_sketches()).unique(start, end, weekday)
+
+    orders = fetch_frame("orders", start=start, end=end)
+    if orders.empty:
+        return 0
+    if weekday is not None:
+        orders = orders[orders["created_at"].dt.weekday == weekday]
+    return int(orders["user_id"].nunique())
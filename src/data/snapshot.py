@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+from src.data.repository import ORDER_TABLES, SNAPSHOT_DIR, iter_table_chunks, table_columns, to_frame
+
+# Local columnar copy of the order history.
+#
+# Layout: <root>/<table>/month=YYYY-MM/part-<first id>.parquet, plus a
+# <table>/_watermark.json holding the last synced id and created_at and the
+# columns stored. Only the columns the widgets declare (WIDGET_COLUMNS) are
+# synced. Incremental syncs page only rows with an id above the watermark; a
+# full sync rebuilds the table in a scratch directory and swaps it in, which
+# also picks up backfills and deletes. A table is rebuilt automatically when
+# the declared columns outgrow the stored ones, or when it was written in an
+# older SNAPSHOT_FORMAT.
+
+WATERMARK_FILE = "_watermark.json"
+
+# Bumped when the file layout or column types change; older snapshots are rebuilt
+SNAPSHOT_FORMAT = 2
+
+# Every page is cast to these types before it is written. Types inferred per
+# page disagree across files: PostgREST sends whole-number amounts as JSON
+# ints, so one month would store int64 and the next double, and the dataset
+# could no longer be read. Columns not listed keep their inferred type.
+COLUMN_TYPES = {
+    "id": pa.int64(),
+    "order_id": pa.int64(),
+    "order_item_id": pa.int64(),
+    "food_item_id": pa.int64(),
+    "addon_id": pa.int64(),
+    "quantity": pa.int64(),
+    "amount": pa.float64(),
+    "price": pa.float64(),
+    "user_id": pa.string(),
+    "status": pa.string(),
+    "address": pa.string(),
+    "created_at": pa.timestamp("us", tz="UTC"),
+}
+
+# Memory-mapped reads: Arrow points into the page cache instead of copying files into the heap
+_filesystem = fs.LocalFileSystem(use_mmap=True)
+
+
+def _read_watermark(table_dir):
+    path = os.path.join(table_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_watermark(table_dir, watermark):
+    path = os.path.join(table_dir, WATERMARK_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(watermark, f)
+    os.replace(path + ".tmp", path)
+
+
+def _arrow_table(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema([pa.field(f.name, COLUMN_TYPES.get(f.name, f.type)) for f in table.schema])
+    return table.cast(schema)
+
+
+# Split a page by the month of created_at and append one Parquet file per month
+def _write_chunk(table_dir, df, part_name):
+    if "created_at" in df:
+        months = df["created_at"].dt.tz_convert("UTC").dt.strftime("%Y-%m")
+    else:
+        months = pd.Series("all", index=df.index)
+
+    for month, part in df.groupby(months):
+        month_dir = os.path.join(table_dir, f"month={month}")
+        os.makedirs(month_dir, exist_ok=True)
+        pq.write_table(_arrow_table(part), os.path.join(month_dir, f"{part_name}.parquet"))
+
+
+def _sync_table(root, table, full):
+    table_dir = os.path.join(root, table)
+    columns = table_columns(table)
+    # Snapshots from before column projection stored every column ("*")
+    stored = _read_watermark(table_dir) or {}
+    stored_columns = stored.get("columns", "*")
+    if stored_columns != "*" and not set(columns.split(",")) <= set(stored_columns.split(",")):
+        full = True
+    if stored and stored.get("format", 1) < SNAPSHOT_FORMAT:
+        full = True
+    target = table_dir + ".rebuild" if full else table_dir
+    if full:
+        shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(target, exist_ok=True)
+
+    watermark = _read_watermark(target)
+    after = watermark["id"] if watermark else None
+    synced = 0
+    for rows in iter_table_chunks(table, columns, after=after):
+        df = to_frame(rows)
+        _write_chunk(target, df, f"part-{rows[0]['id']}")
+
+        # Advance the watermark per page so an interrupted sync resumes where it stopped
+        watermark = {"id": rows[-1]["id"], "columns": columns, "format": SNAPSHOT_FORMAT}
+        if "created_at" in df:
+            watermark["created_at"] = df["created_at"].max().isoformat()
+        _write_watermark(target, watermark)
+        synced += len(rows)
+
+    if full:
+        shutil.rmtree(table_dir, ignore_errors=True)
+        os.replace(target, table_dir)
+    return synced
+
+
+# Append rows newer than each table's watermark (or rebuild everything with full=True).
+# Returns the number of rows written per table.
+def sync(root=SNAPSHOT_DIR, full=False, tables=ORDER_TABLES):
+    return {table: _sync_table(root, table, full) for table in tables}
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+# Read a snapshotted table, optionally limited to start <= created_at < end and to
+# rows whose column is in the given values (e.g. order_item_id=[...]).
+# Month partitions outside the range are skipped without being opened.
+def read_frame(root, table, columns="*", start=None, end=None, **isin):
+    table_dir = os.path.join(root, table)
+    if not os.path.isdir(table_dir):
+        return pd.DataFrame()
+
+    dataset = ds.dataset(table_dir, format="parquet", partitioning="hive", filesystem=_filesystem)
+    if columns == "*":
+        columns = [name for name in dataset.schema.names if name != "month"]
+    else:
+        columns = [name.strip() for name in columns.split(",")]
+
+    condition = None
+    if start is not None:
+        start = _utc(start)
+        condition = (ds.field("month") >= start.strftime("%Y-%m")) & (ds.field("created_at") >= start)
+    if end is not None:
+        end = _utc(end)
+        upper = (ds.field("month") <= end.strftime("%Y-%m")) & (ds.field("created_at") < end)
+        condition = upper if condition is None else condition & upper
+    for column, values in isin.items():
+        match = ds.field(column).isin(values)
+        condition = match if condition is None else condition & match
+
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the local Parquet snapshot of the order tables.")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="snapshot directory (default: $SNAPSHOT_DIR)")
+    parser.add_argument("--full", action="store_true", help="rebuild from scratch to pick up backfills and deletes")
+    args = parser.parse_args()
+
+    if not args.dir:
+        parser.error("no snapshot directory; pass --dir or set SNAPSHOT_DIR")
+
+    for table, rows in sync(args.dir, full=args.full).items():
+        print(f"{table}: {rows} rows synced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+
+def _naive_utc(series):
+    if series.dt.tz is not None:
+        series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+    return series.to_numpy("datetime64[ns]")
+
+
+# Positions where a sorted array changes value, i.e. where each group starts
+def _group_starts(values):
+    if not len(values):
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+
+
+# Offsets of each day and month in a frame sorted by a datetime column, so
+# picking a date or month is a binary search plus a positional slice
+# instead of a comparison over every row.
+class TimeIndex:
+    def __init__(self, series):
+        values = _naive_utc(series)
+        self.length = len(values)
+
+        days = values.astype("datetime64[D]")
+        self.day_starts = _group_starts(days)
+        self.days = days[self.day_starts]
+
+        months = values.astype("datetime64[M]")
+        self.month_starts = _group_starts(months)
+        self.months = months[self.month_starts]
+
+    def _group(self, keys, starts, key):
+        i = keys.searchsorted(key)
+        if i == len(keys) or keys[i] != key:
+            return slice(0, 0)
+        end = starts[i + 1] if i + 1 < len(starts) else self.length
+        return slice(int(starts[i]), int(end))
+
+    # Rows on a calendar day (date, Timestamp or string)
+    def day(self, date):
+        return self._group(self.days, self.day_starts, np.datetime64(pd.Timestamp(date).date(), "D"))
+
+    # Rows in a month (pandas Period)
+    def month(self, period):
+        return self._group(self.months, self.month_starts, np.datetime64(period.start_time.date(), "M"))
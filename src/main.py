@@ -1,5 +1,6 @@
+import importlib
 import streamlit as st
-from src.pages import home, analytics
+from src import metrics
 import os
 from dotenv import load_dotenv
 
@@ -8,6 +9,10 @@ load_dotenv()
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 
+# Page modules pull in pandas, altair and the Supabase client, so they are
+# imported on first navigation instead of before the login form can render
+PAGES = {"Home": "src.pages.home", "Analytics": "src.pages.analytics"}
+
 # Login function
 def login():
     st.title("🔐 Admin Login")
@@ -35,10 +40,11 @@ def run():
         login()
         return
 
+    metrics.start_run()
     st.sidebar.title("🍽️ Admin Menu")
 
     # Main menu options
-    menu_selection = st.sidebar.radio("Go to", ["Home", "Analytics"])
+    menu_selection = st.sidebar.radio("Go to", list(PAGES))
 
     # Spacer to push logout to the bottom
     st.sidebar.markdown("<br><br><br><br><br><br><br><br><br><br>", unsafe_allow_html=True)
@@ -51,10 +57,13 @@ def run():
         st.rerun()
 
     # Render selected page
-    if menu_selection == "Home":
-        home.show()
-    elif menu_selection == "Analytics":
-        analytics.show()
+    importlib.import_module(PAGES[menu_selection]).show()
+    metrics.record_page(menu_selection)
+
+    # Only reached by logged-in admins
+    from src.widgets.performance_panel import render_performance_panel
+    render_performance_panel()
+    metrics.flush()
 
 
 if __name__ == "__main__":
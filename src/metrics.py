@@ -0,0 +1,283 @@
+import atexit
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# Query and render instrumentation.
+#
+# instrument(client) wraps the Supabase client so every execute() (and storage
+# upload/remove) is recorded with its source table, filters, latency, row count
+# and response size. span()/altair_chart() time widget compute and chart
+# building; record_page() totals each page load. Events are collected per
+# Streamlit rerun (start_run) for the Performance panel, kept process-wide for
+# export, and optionally appended to METRICS_JSONL or summarised in a
+# Prometheus textfile at METRICS_PROM_FILE. Both files are written by flush()
+# (after each rerun, and every FLUSH_SECONDS from a background thread for
+# fragment reruns), so recording never does file I/O under the shared lock.
+
+METRICS_JSONL = os.getenv("METRICS_JSONL")
+METRICS_PROM_FILE = os.getenv("METRICS_PROM_FILE")
+
+# Most recent events kept in memory across all sessions
+HISTORY_SIZE = 2000
+
+# Seconds between background flushes while an export file is configured
+FLUSH_SECONDS = 5
+
+history = deque(maxlen=HISTORY_SIZE)
+_totals = defaultdict(float)
+_lock = threading.Lock()
+# Events waiting to be appended to METRICS_JSONL by the next flush()
+_pending = []
+# Keeps concurrent flushes from interleaving or reordering file writes
+_flush_lock = threading.Lock()
+_flusher = None
+_run = contextvars.ContextVar("metrics_run", default=None)
+# Transport counters (requests, connections, tls_handshakes, retries) of the
+# call executing on this thread; the HTTP transport adds to them via note_transport()
+_transport = contextvars.ContextVar("metrics_transport", default=None)
+
+
+# ---------- Recording ----------
+
+# Begin collecting a rerun's events; returns the list they are appended to
+def start_run():
+    events = []
+    _run.set(events)
+    return events
+
+
+def current_run():
+    return _run.get() or []
+
+
+def record(kind, **fields):
+    event = {"kind": kind, "at": round(time.time(), 3), **fields}
+    events = _run.get()
+    if events is not None:
+        events.append(event)
+    with _lock:
+        history.append(event)
+        if kind == "query":
+            labels = (("source", event["source"]),)
+            _totals[("supabase_queries_total", labels)] += 1
+            _totals[("supabase_query_seconds_total", labels)] += event["ms"] / 1000
+            _totals[("supabase_rows_total", labels)] += event["rows"]
+            _totals[("supabase_response_bytes_total", labels)] += event["bytes"]
+        elif kind == "page":
+            labels = (("page", event["page"]),)
+            _totals[("page_loads_total", labels)] += 1
+            _totals[("page_response_bytes_total", labels)] += event["bytes"]
+        else:
+            labels = (("widget", event["widget"]), ("stage", event["stage"]))
+            _totals[("widget_render_seconds_total", labels)] += event["ms"] / 1000
+            _totals[("widget_renders_total", labels)] += 1
+        if METRICS_JSONL:
+            _pending.append(event)
+            _start_flusher()
+    return event
+
+
+# Called by the HTTP transport for the request in flight on this thread
+def note_transport(name, n=1):
+    notes = _transport.get()
+    if notes is not None:
+        notes[name] = notes.get(name, 0) + n
+
+
+# Run a call with fresh transport counters; yields the dict they are added to
+@contextmanager
+def _transport_notes():
+    notes = {}
+    token = _transport.set(notes)
+    try:
+        yield notes
+    finally:
+        _transport.reset(token)
+
+
+# Per-call connection fields for a query event: whether every attempt reused a
+# pooled connection and whether a TLS handshake was made. None when no HTTP
+# request was seen (the offline stand-in).
+def _connection_fields(notes):
+    if not notes.get("requests"):
+        return {"reused": None, "tls_handshake": None}
+    return {"reused": not notes.get("connections"), "tls_handshake": bool(notes.get("tls_handshakes"))}
+
+
+# Close a page load: one "page" event totalling its queries and response bytes
+def record_page(page):
+    queries = [e for e in current_run() if e["kind"] == "query"]
+    return record(
+        "page",
+        page=page,
+        queries=len(queries),
+        rows=sum(e["rows"] for e in queries),
+        bytes=sum(e["bytes"] for e in queries),
+    )
+
+
+# Sum of a counter over all its labels, e.g. total("supabase_response_bytes_total")
+def total(name):
+    with _lock:
+        return sum(value for (metric, _), value in _totals.items() if metric == name)
+
+
+@contextmanager
+def span(widget, stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record("render", widget=widget, stage=stage, ms=(time.perf_counter() - start) * 1000)
+
+
+# st.altair_chart, timed as the widget's "chart" stage (spec building and serialisation)
+def altair_chart(widget, chart, **kwargs):
+    import streamlit as st
+    with span(widget, "chart"):
+        return st.altair_chart(chart, **kwargs)
+
+
+# ---------- Export ----------
+
+def prometheus_text():
+    with _lock:
+        totals = dict(_totals)
+    lines = []
+    for (name, labels), value in sorted(totals.items()):
+        label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+        lines.append(f"flavorfleet_{name}{{{label_text}}} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+# Flush every FLUSH_SECONDS on a daemon thread (and once at exit); call with _lock held
+def _start_flusher():
+    global _flusher
+    if _flusher is None:
+        def loop():
+            while True:
+                time.sleep(FLUSH_SECONDS)
+                flush()
+        _flusher = threading.Thread(target=loop, name="metrics-flush", daemon=True)
+        _flusher.start()
+        atexit.register(flush)
+
+
+# Append the buffered events to METRICS_JSONL and rewrite the Prometheus
+# textfile (atomically, for node_exporter's collector)
+def flush():
+    global _pending
+    with _flush_lock:
+        if METRICS_JSONL:
+            with _lock:
+                events, _pending = _pending, []
+            if events:
+                with open(METRICS_JSONL, "a") as f:
+                    f.writelines(json.dumps(event, default=str) + "\n" for event in events)
+        if METRICS_PROM_FILE:
+            tmp = f"{METRICS_PROM_FILE}.tmp"
+            with open(tmp, "w") as f:
+                f.write(prometheus_text())
+            os.replace(tmp, METRICS_PROM_FILE)
+
+
+# ---------- Client wrapper ----------
+
+# Rough wire size of a response; PostgREST sends the rows as JSON
+def _size(data):
+    return len(json.dumps(data, default=str)) if data is not None else 0
+
+
+def _describe(steps):
+    return " ".join(f"{name}({', '.join(map(str, args))})" for name, args in steps)
+
+
+class _TracedQuery:
+    def __init__(self, builder, source, steps=()):
+        self._builder = builder
+        self._source = source
+        self._steps = list(steps)
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return _TracedQuery(attr(*args, **kwargs), self._source, self._steps + [(name, args)])
+        return call
+
+    def execute(self):
+        start = time.perf_counter()
+        with _transport_notes() as notes:
+            response = self._builder.execute()
+        data = getattr(response, "data", None)
+        record(
+            "query",
+            source=self._source,
+            filters=_describe(self._steps),
+            ms=(time.perf_counter() - start) * 1000,
+            rows=len(data) if isinstance(data, list) else int(data is not None),
+            bytes=_size(data),
+            **_connection_fields(notes),
+        )
+        return response
+
+
+class _TracedBucket:
+    RECORDED = {"upload", "remove", "download", "list", "move", "update"}
+
+    def __init__(self, bucket, name):
+        self._bucket = bucket
+        self._name = name
+
+    def __getattr__(self, name):
+        attr = getattr(self._bucket, name)
+        if name not in self.RECORDED:
+            return attr
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            with _transport_notes() as notes:
+                result = attr(*args, **kwargs)
+            record(
+                "query", source=f"storage:{self._name}", filters=name, ms=(time.perf_counter() - start) * 1000,
+                rows=0, bytes=0, **_connection_fields(notes),
+            )
+            return result
+        return call
+
+
+class _TracedStorage:
+    def __init__(self, storage):
+        self._storage = storage
+
+    def from_(self, bucket):
+        return _TracedBucket(self._storage.from_(bucket), bucket)
+
+    def __getattr__(self, name):
+        return getattr(self._storage, name)
+
+
+class InstrumentedClient:
+    def __init__(self, client):
+        self._client = client
+        self.storage = _TracedStorage(client.storage)
+
+    def table(self, name):
+        return _TracedQuery(self._client.table(name), name)
+
+    def rpc(self, name, params=None, **kwargs):
+        return _TracedQuery(self._client.rpc(name, params or {}, **kwargs), f"rpc:{name}", [("rpc", (params,))])
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def instrument(client):
+    return InstrumentedClient(client)
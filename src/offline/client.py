@@ -0,0 +1,314 @@
+import os
+import random
+import threading
+import time
+from types import SimpleNamespace
+import pandas as pd
+
+# In-memory stand-in for the supabase-py client, backed by pandas frames.
+#
+# It covers the surface this app uses: table().select/insert/update/delete
+# with eq/neq/gt/gte/lt/lte/in_ filters, order, limit and range, rpc() for the
+# functions in sql/analytics_functions.sql, and storage.from_(). Like
+# PostgREST, every response is capped at max_rows rows, and each execute()
+# sleeps for `latency` seconds (plus up to `jitter`) to imitate a round trip.
+#
+# Set FAKE_SUPABASE=1 to run the whole app against it (see src/supabase_client.py).
+
+DEFAULT_MAX_ROWS = 1000
+
+OPERATORS = {
+    "eq": lambda s, v: s == v,
+    "neq": lambda s, v: s != v,
+    "gt": lambda s, v: s > v,
+    "gte": lambda s, v: s >= v,
+    "lt": lambda s, v: s < v,
+    "lte": lambda s, v: s <= v,
+    "in": lambda s, v: s.isin(v),
+    "is": lambda s, v: s.isna() if v in (None, "null") else s == v,
+}
+
+# Range operators that can be answered by binary search on a sorted column
+SEARCH_SIDES = {"gt": ("right", None), "gte": ("left", None), "lt": (None, "left"), "lte": (None, "right")}
+
+
+def _coerce(series, value):
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        ts = pd.Timestamp(value)
+        return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return value
+
+
+# JSON-shaped rows, the way PostgREST returns them
+def _records(df):
+    out = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            text = series.dt.tz_convert("UTC").dt.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+            series = text.where(series.notna(), None)
+        out[column] = series.astype(object).where(series.notna(), None)
+    return pd.DataFrame(out, index=df.index).to_dict("records")
+
+
+class Query:
+    def __init__(self, client, table=None, rpc=None):
+        self.client = client
+        self.table = table
+        self.rpc = rpc
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.ordering = []
+        self.row_limit = None
+        self.row_offset = 0
+
+    # ---------- Actions ----------
+    def select(self, columns="*", count=None):
+        self.action, self.columns = "select", columns
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, values):
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    # ---------- Filters and modifiers ----------
+    def _filter(self, op, column, value):
+        self.filters.append((op, column, value))
+        return self
+
+    def eq(self, column, value): return self._filter("eq", column, value)
+    def neq(self, column, value): return self._filter("neq", column, value)
+    def gt(self, column, value): return self._filter("gt", column, value)
+    def gte(self, column, value): return self._filter("gte", column, value)
+    def lt(self, column, value): return self._filter("lt", column, value)
+    def lte(self, column, value): return self._filter("lte", column, value)
+    def in_(self, column, values): return self._filter("in", column, list(values))
+    def is_(self, column, value): return self._filter("is", column, value)
+
+    def order(self, column, *, desc=False, nullsfirst=None):
+        self.ordering.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size):
+        self.row_limit = size
+        return self
+
+    def offset(self, size):
+        self.row_offset = size
+        return self
+
+    def range(self, start, end):
+        self.row_offset, self.row_limit = start, end - start + 1
+        return self
+
+    # ---------- Execution ----------
+    def _matching(self, df, sorted_columns=()):
+        # Narrow sorted columns (ids, created_at) by binary search first so
+        # keyset pagination over large tables stays cheap
+        lo, hi = 0, len(df)
+        rest = []
+        for op, column, value in self.filters:
+            if op in SEARCH_SIDES and column in sorted_columns:
+                target = _coerce(df[column], value)
+                low_side, high_side = SEARCH_SIDES[op]
+                if low_side:
+                    lo = max(lo, int(df[column].searchsorted(target, side=low_side)))
+                else:
+                    hi = min(hi, int(df[column].searchsorted(target, side=high_side)))
+            else:
+                rest.append((op, column, value))
+        df = df.iloc[lo:max(lo, hi)]
+        for op, column, value in rest:
+            df = df[OPERATORS[op](df[column], _coerce(df[column], value))]
+        return df
+
+    def _ordered(self, df):
+        if not self.ordering:
+            return df
+        return df.sort_values(
+            [c for c, _, _ in self.ordering],
+            ascending=[not desc for _, desc, _ in self.ordering],
+            na_position="first" if self.ordering[0][2] else "last",
+            kind="stable",
+        )
+
+    def _shape(self, df, ordered=False):
+        if not ordered:
+            df = self._ordered(df)
+        limit = min(self.row_limit or self.client.max_rows, self.client.max_rows)
+        df = df.iloc[self.row_offset:self.row_offset + limit]
+        if self.columns.strip() != "*":
+            df = df[[c.strip() for c in self.columns.split(",")]]
+        return _records(df)
+
+    def execute(self):
+        self.client.round_trip()
+        if self.rpc:
+            data = self._shape(self.client.result(self), ordered=True)
+        elif self.action == "select":
+            data = self._shape(self._matching(*self.client.frame(self.table)))
+        else:
+            data = self.client.write(self)
+        return SimpleNamespace(data=data, count=None)
+
+
+class Bucket:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+
+    def upload(self, path, file, file_options=None):
+        self.client.round_trip()
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as fh:
+                file = fh.read()
+        self.client.objects[(self.name, path)] = file.read() if hasattr(file, "read") else file
+        return SimpleNamespace(path=path, full_path=f"{self.name}/{path}")
+
+    def get_public_url(self, path):
+        return f"{self.client.url}/storage/v1/object/public/{self.name}/{path}"
+
+    def remove(self, paths):
+        self.client.round_trip()
+        return [self.client.objects.pop((self.name, p), None) and {"name": p} for p in paths]
+
+
+class FakeSupabase:
+    def __init__(self, tables=None, latency=0.0, jitter=0.0, max_rows=DEFAULT_MAX_ROWS, url="http://fake-supabase.local"):
+        self.tables = {name: df.reset_index(drop=True) for name, df in (tables or {}).items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rows = max_rows
+        self.url = url
+        self.objects = {}
+        self.queries = 0
+        self._sorted = {}
+        self._lock = threading.Lock()
+        self.storage = SimpleNamespace(from_=lambda bucket: Bucket(self, bucket))
+
+    # Synthetic data from src/offline/data.py, sized by FAKE_SUPABASE_SCALE etc.
+    @classmethod
+    def from_env(cls):
+        from src.offline.data import generate
+        return cls(
+            generate(os.getenv("FAKE_SUPABASE_SCALE", "10k"), seed=int(os.getenv("FAKE_SUPABASE_SEED", "42"))),
+            latency=float(os.getenv("FAKE_SUPABASE_LATENCY_MS", "0")) / 1000,
+            jitter=float(os.getenv("FAKE_SUPABASE_JITTER_MS", "0")) / 1000,
+            max_rows=int(os.getenv("FAKE_SUPABASE_MAX_ROWS", str(DEFAULT_MAX_ROWS))),
+        )
+
+    def table(self, name):
+        return Query(self, table=name)
+
+    def rpc(self, name, params=None, **options):
+        return Query(self, rpc=(name, params or {}))
+
+    def round_trip(self):
+        with self._lock:
+            self.queries += 1
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+    # Current frame plus the columns known to be sorted ascending
+    def frame(self, name):
+        with self._lock:
+            df = self.tables.get(name, pd.DataFrame())
+            if name not in self._sorted:
+                self._sorted[name] = {c for c in ("id", "created_at") if c in df and df[c].is_monotonic_increasing}
+            return df, self._sorted[name]
+
+    def write(self, query):
+        with self._lock:
+            df = self.tables.get(query.table, pd.DataFrame(columns=["id"]))
+            self._sorted.pop(query.table, None)
+            if query.action == "insert":
+                next_id = int(df["id"].max()) + 1 if len(df) else 1
+                rows = [{"id": next_id + i, **row} for i, row in enumerate(query.payload)]
+                added = pd.DataFrame(rows)
+                # Column defaults and types as the database would apply them
+                if "created_at" in df:
+                    stamps = added["created_at"] if "created_at" in added else None
+                    added["created_at"] = pd.to_datetime(stamps, utc=True) if stamps is not None else pd.Timestamp.now(tz="UTC")
+                self.tables[query.table] = pd.concat([df, added], ignore_index=True) if len(df) else added
+                return _records(added)
+            mask = pd.Series(True, index=df.index)
+            for op, column, value in query.filters:
+                mask &= OPERATORS[op](df[column], _coerce(df[column], value))
+            if query.action == "update":
+                df = df.copy()
+                for column, value in query.payload.items():
+                    df.loc[mask, column] = value
+                self.tables[query.table] = df
+                return _records(df[mask])
+            self.tables[query.table] = df[~mask].reset_index(drop=True)
+            return _records(df[mask])
+
+    # ---------- RPCs (pandas versions of sql/analytics_functions.sql) ----------
+
+    # Like Postgres, every call (each page included) runs the function again
+    def result(self, query):
+        name, params = query.rpc
+        return query._ordered(query._matching(self.call(name, params)))
+
+    def call(self, name, params):
+        start, end = params.get("start_ts"), params.get("end_ts")
+
+        def in_range(table):
+            df, _ = self.frame(table)
+            query = Query(self)
+            if start:
+                query.gte("created_at", start)
+            if end:
+                query.lt("created_at", end)
+            return query._matching(df, {"created_at"} & set(self._sorted[table]))
+
+        if name == "order_totals":
+            orders, items = in_range("orders"), in_range("order_items")
+            return pd.DataFrame([{
+                "orders": len(orders),
+                "revenue": float(orders["amount"].sum()),
+                "unique_users": int(orders["user_id"].nunique()),
+                "items_sold": int(items["quantity"].sum()),
+            }])
+
+        if name == "order_rollup":
+            orders, items = in_range("orders"), in_range("order_items")
+            item_addons = self.frame("order_item_addons")[0]
+            foods = self.frame("foods")[0]
+
+            def stamp(df):
+                return df.assign(day=df["created_at"].dt.date, hour=df["created_at"].dt.hour)
+
+            per_order = stamp(orders).groupby(["day", "hour"]).agg(orders=("id", "size"), revenue=("amount", "sum")).reset_index()
+
+            items = stamp(items).merge(foods[["id", "category_id"]].rename(columns={"id": "food_item_id"}), on="food_item_id")
+            addon_counts = item_addons["order_item_id"].value_counts()
+            items["addons"] = items["id"].map(addon_counts).fillna(0).astype(int)
+            per_food = items.groupby(["day", "food_item_id", "category_id"]).agg(
+                quantity=("quantity", "sum"), addons=("addons", "sum")
+            ).reset_index()
+
+            chosen = item_addons.merge(items[["id", "day"]], left_on="order_item_id", right_on="id")
+            per_addon = chosen.groupby(["day", "addon_id"]).size().rename("addons").reset_index()
+
+            cube = pd.concat([per_order, per_food, per_addon], ignore_index=True)
+            columns = ["day", "hour", "food_item_id", "category_id", "addon_id", "orders", "revenue", "quantity", "addons"]
+            cube = cube.reindex(columns=columns)
+            cube["day"] = cube["day"].astype(str)
+            return cube
+
+        if name == "user_sketches":
+            from src.data.sketches import sketch_rows
+            return sketch_rows(in_range("orders"))
+
+        raise ValueError(f"Unknown function: {name}")
@@ -0,0 +1,144 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Deterministic synthetic FlavorFleet data for offline runs and benchmarks.
+#
+# generate(scale) returns {table: DataFrame} for categories, foods, addons,
+# orders, order_items and order_item_addons with the same columns the app
+# reads from Supabase. Ids are increasing integers and orders are sorted by
+# created_at, like the production tables. The same seed always yields the
+# same data.
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+CATEGORY_NAMES = ["Burgers", "Pizza", "Biryani", "Chinese", "South Indian", "Desserts", "Beverages", "Wraps"]
+
+# Relative order volume per hour of day: quiet nights, lunch and dinner peaks
+HOURLY_WEIGHTS = np.array([
+    1, 1, 1, 1, 1, 1, 2, 4, 6, 5, 4, 7, 12, 13, 9, 5, 4, 6, 10, 14, 15, 11, 6, 3,
+], dtype=float)
+
+
+def parse_scale(scale):
+    if isinstance(scale, int):
+        return scale
+    return SCALES.get(str(scale).lower()) or int(scale)
+
+
+def _menu(rng, foods_per_category):
+    categories = pd.DataFrame({"id": np.arange(1, len(CATEGORY_NAMES) + 1), "name": CATEGORY_NAMES})
+
+    category_ids = np.repeat(categories["id"].to_numpy(), foods_per_category)
+    food_ids = np.arange(1, len(category_ids) + 1)
+    foods = pd.DataFrame({
+        "id": food_ids,
+        "name": [f"{CATEGORY_NAMES[c - 1]} Special {i}" for i, c in zip(food_ids, category_ids)],
+        "description": "Freshly made to order.",
+        "price": rng.integers(8, 50, len(food_ids)) * 10.0,
+        "image_url": "",
+        "available": rng.random(len(food_ids)) > 0.1,
+        "category_id": category_ids,
+    })
+
+    addon_counts = rng.integers(0, 4, len(food_ids))
+    addon_food_ids = np.repeat(food_ids, addon_counts)
+    addons = pd.DataFrame({
+        "id": np.arange(1, len(addon_food_ids) + 1),
+        "food_id": addon_food_ids,
+        "name": rng.choice(["Extra Cheese", "Dip", "Fries", "Coke", "Extra Spicy", "Salad"], len(addon_food_ids)),
+        "price": rng.integers(1, 8, len(addon_food_ids)) * 10.0,
+    })
+    return categories, foods, addons
+
+
+def generate(scale="10k", seed=42, days=365, end="2025-06-30", foods_per_category=8):
+    rng = np.random.default_rng(seed)
+    n_orders = parse_scale(scale)
+    categories, foods, addons = _menu(rng, foods_per_category)
+
+    # ---------- Orders ----------
+    end_ts = pd.Timestamp(end, tz="UTC").normalize() + pd.Timedelta(days=1)
+    day_offsets = rng.integers(0, days, n_orders)
+    hours = rng.choice(24, n_orders, p=HOURLY_WEIGHTS / HOURLY_WEIGHTS.sum())
+    seconds = (days - day_offsets) * -86_400 + hours * 3_600 + rng.integers(0, 3_600, n_orders)
+    created_at = np.sort(end_ts.as_unit("us").to_datetime64() + seconds.astype("timedelta64[s]"))
+    order_ids = np.arange(1, n_orders + 1)
+    user_ids = "user-" + pd.Series(rng.integers(1, max(2, n_orders // 8), n_orders)).astype(str)
+
+    # ---------- Order items ----------
+    items_per_order = rng.integers(1, 5, n_orders)
+    item_order_idx = np.repeat(np.arange(n_orders), items_per_order)
+    n_items = len(item_order_idx)
+    food_idx = rng.integers(0, len(foods), n_items)
+    quantity = rng.integers(1, 4, n_items)
+    item_prices = foods["price"].to_numpy()[food_idx]
+    order_items = pd.DataFrame({
+        "id": np.arange(1, n_items + 1),
+        "order_id": order_ids[item_order_idx],
+        "food_item_id": foods["id"].to_numpy()[food_idx],
+        "quantity": quantity,
+        "price": item_prices,
+        "created_at": created_at[item_order_idx],
+    })
+
+    # ---------- Order item add-ons ----------
+    # Up to two distinct add-ons per item, drawn from that food's add-ons:
+    # a random first pick and, for doubles, the next add-on round the list
+    addons = addons.sort_values(["food_id", "id"], ignore_index=True)
+    per_food = addons.groupby("food_id").size().reindex(foods["id"], fill_value=0).to_numpy()
+    first_addon = np.concatenate([[0], np.cumsum(per_food)[:-1]])
+    available = per_food[food_idx]
+    picks = np.minimum(rng.integers(0, 3, n_items), available)
+    offset = rng.integers(0, np.maximum(available, 1))
+    item_idx = np.repeat(np.arange(n_items), picks)
+    nth = np.arange(len(item_idx)) - np.repeat(np.cumsum(picks) - picks, picks)
+    slot = first_addon[food_idx[item_idx]] + (offset[item_idx] + nth) % available[item_idx]
+    order_item_addons = pd.DataFrame({
+        "id": np.arange(1, len(item_idx) + 1),
+        "order_item_id": item_idx + 1,
+        "addon_id": addons["id"].to_numpy()[slot],
+    })
+
+    # Order amount = items plus chosen add-ons
+    line_totals = item_prices * quantity
+    addon_totals = np.bincount(item_idx, weights=addons["price"].to_numpy()[slot], minlength=n_items)
+    amounts = np.bincount(item_order_idx, weights=line_totals + addon_totals, minlength=n_orders)
+
+    orders = pd.DataFrame({
+        "id": order_ids,
+        "user_id": user_ids.to_numpy(),
+        "amount": amounts.round(2),
+        "status": rng.choice(["delivered", "delivered", "delivered", "cancelled"], n_orders),
+        "address": "221B Baker Street",
+        "created_at": created_at,
+    })
+    orders["created_at"] = orders["created_at"].dt.tz_localize("UTC")
+    order_items["created_at"] = order_items["created_at"].dt.tz_localize("UTC")
+
+    return {
+        "categories": categories,
+        "foods": foods,
+        "addons": addons,
+        "orders": orders,
+        "order_items": order_items,
+        "order_item_addons": order_item_addons,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic FlavorFleet tables as CSV (e.g. for \\copy into a local Postgres).")
+    parser.add_argument("--scale", default="10k", help="orders to generate: 10k, 100k, 1m, 10m or a number")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="synthetic_data")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for table, df in generate(args.scale, seed=args.seed).items():
+        df.to_csv(os.path.join(args.out, f"{table}.csv"), index=False)
+        print(f"{table}: {len(df):,} rows")
+
+
+if __name__ == "__main__":
+    main()
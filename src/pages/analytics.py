@@ -1,20 +1,121 @@
 import streamlit as st
-from src.supabase_client import supabase
-import pandas as pd
-import altair as alt
+from src.data.repository import fetch_rpc
+from src.data.catalog import fetch_catalog
+from src.data.customers import customer_index
+from src.data.parallel import FetchError, fetch_concurrently
+from src.data.live import LIVE_REFRESH_SECONDS, live
+from src.data.rollups import fetch_cube, order_dates
+from src.data.sketches import fetch_user_sketches
+from src.metrics import span
 from ..widgets import monthly_summary
 from ..widgets import weekday_analysis
 from ..widgets import daily_insight
+from ..widgets import live_dashboard
+from ..widgets import customer_insights
+from ..widgets import order_export
 
-def fetch_all_data():
-    return {
-        "orders": supabase.table("orders").select("*").execute().data,
-        "order_items": supabase.table("order_items").select("*").execute().data,
-        "order_addons": supabase.table("order_item_addons").select("*").execute().data,
-        "foods": supabase.table("foods").select("id, name").execute().data,
-        "addons": supabase.table("addons").select("id, name").execute().data
-    }
+# ---------- Sections ----------
+# Each section loads its own data and runs as a fragment, so only the open
+# section is computed and its widgets rerun just that section.
 
+def _load(loaders):
+    try:
+        return fetch_concurrently(loaders)
+    except FetchError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+
+
+@st.fragment
+def monthly_section():
+    with span("monthly_summary", "load"):
+        data = _load({"catalog": fetch_catalog, "order_rollup": fetch_cube, "user_sketches": fetch_user_sketches})
+    monthly_summary.show(data["catalog"], data["order_rollup"], data["user_sketches"])
+
+
+@st.fragment
+def weekday_section():
+    with span("weekday_analysis", "load"):
+        data = _load({"order_rollup": fetch_cube, "user_sketches": fetch_user_sketches})
+    weekday_analysis.render_weekday_analysis(data["order_rollup"], data["user_sketches"])
+
+
+@st.fragment
+def daily_section():
+    with span("daily_insights", "load"):
+        data = _load({"catalog": fetch_catalog, "order_rollup": fetch_cube})
+    catalog = data["catalog"]
+    daily_insight.render_daily_insights(
+        foods=catalog["foods"],
+        addons=catalog["addons"],
+        categories=catalog["categories"],
+        cube=data["order_rollup"]
+    )
+
+
+# Reruns on its own every LIVE_REFRESH_SECONDS while open; each run applies only new rows
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_section():
+    with span("live_dashboard", "load"):
+        data = _load({"catalog": fetch_catalog, "live": live.refresh})
+    live_dashboard.render_live_dashboard(data["live"], data["catalog"]["foods"])
+
+
+# Seconds between progress checks while the customer index is first built
+BUILD_POLL_SECONDS = 1
+
+
+# Polls the background build and reruns the page once the index is ready
+@st.fragment(run_every=BUILD_POLL_SECONDS)
+def _customer_index_progress():
+    if customer_index.built:
+        st.rerun()
+    if customer_index.build_error is not None:
+        st.error(f"❌ Building the customer index failed: {customer_index.build_error}")
+        return
+    loaded = customer_index.loaded
+    st.info(
+        f"⏳ Building the customer index: {loaded['orders']:,} orders and "
+        f"{loaded['order_items']:,} items read so far."
+    )
+
+
+# The shared customer index applies only orders placed since its last refresh.
+# Its first build reads the whole history, so it runs in the background (not
+# under the fetch deadline) and the section shows progress until it is done.
+@st.fragment
+def customers_section():
+    with span("customer_insights", "load"):
+        catalog = _load({"catalog": fetch_catalog})["catalog"]
+        food_categories = catalog["foods"].set_index("id")["category_id"]
+        if not customer_index.built:
+            customer_index.build_in_background(food_categories)
+            _customer_index_progress()
+            return
+        index = _load({"customers": lambda: customer_index.refresh(food_categories)})["customers"]
+    customer_insights.render_customer_insights(index, catalog)
+
+
+@st.fragment
+def export_section():
+    with span("order_export", "load"):
+        cube = _load({"order_rollup": fetch_cube})["order_rollup"]
+    order_export.render_order_export(order_dates(cube))
+
+
+def more_section():
+    st.info("More analytical features will be added here in the future.")
+
+
+SECTIONS = {
+    "📆 Monthly Summary": monthly_section,
+    "📅 Weekday Analysis": weekday_section,
+    "📅 Daily Insights": daily_section,
+    "🔴 Live": live_section,
+    "👥 Customers": customers_section,
+    "📤 Export": export_section,
+    "🔍 More Insights (Coming Soon)": more_section,
+}
 
 # Main Page
 def show():
@@ -25,70 +126,27 @@ def show():
     st.set_page_config(page_title="📈 Analytics Dashboard", layout="wide")
     st.title("📊 FlavorFleet Analytics Dashboard")
 
-    # Fetch all data
-    data = fetch_all_data()
-    orders = data["orders"]
-    order_items = data["order_items"]
-    order_addons = data["order_addons"]
-    foods = data["foods"]
-    addons = data["addons"]
-
-    # Convert to DataFrames
-    orders_df = pd.DataFrame(orders)
-    order_items_df = pd.DataFrame(order_items)
-    order_addons_df = pd.DataFrame(order_addons)
-    foods_df = pd.DataFrame(foods)
-    addons_df = pd.DataFrame(addons)
-
-    # Preprocess timestamps
-    if not orders_df.empty:
-        orders_df["created_at"] = pd.to_datetime(orders_df["created_at"], format="ISO8601")
-    if not order_items_df.empty:
-        order_items_df["created_at"] = pd.to_datetime(order_items_df["created_at"], format="ISO8601")
+    # Headline totals are aggregated in Postgres; sections load the rest on demand
+    totals = _load({"order_totals": lambda: fetch_rpc("order_totals")})["order_totals"]
+    total_orders = int(totals["orders"].iloc[0]) if not totals.empty else 0
 
     # ---------- Metrics ----------
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("📦 Total Orders", len(orders_df))
+        st.metric("📦 Total Orders", total_orders)
     with col2:
-        st.metric("💰 Total Revenue", f"₹ {orders_df['amount'].sum():,.2f}")
+        st.metric("💰 Total Revenue", f"₹ {totals['revenue'].sum():,.2f}")
     with col3:
-        st.metric("🧍 Unique Users", orders_df["user_id"].nunique())
+        st.metric("🧍 Unique Users", int(totals["unique_users"].sum()))
     with col4:
-        st.metric("🍽️ Total Items Sold", int(order_items_df["quantity"].sum()))
+        st.metric("🍽️ Total Items Sold", int(totals["items_sold"].sum()))
 
     st.markdown("---")
 
-    # ---------- Expandable Sections ----------
-
-    with st.expander("📆 Monthly Summary", expanded=False):
-        monthly_summary.show()
-
-    with st.expander("📅 Weekday Analysis", expanded=False):
-        if not orders_df.empty:
-            weekday_analysis.render_weekday_analysis(
-                orders=orders,
-                order_items=order_items,
-                foods=foods,
-                addons=addons,
-                order_addons=order_addons
-            )
-        else:
-            st.warning("No order data available for weekday analysis.")
-
-    with st.expander("📅 Daily Insights", expanded=False):  
-        if not orders_df.empty:
-            daily_insight.render_daily_insights(
-                orders=orders,
-                order_items=order_items,
-                foods=foods,
-                addons=addons,
-                order_addons=order_addons,
-                categories=supabase.table("categories").select("*").execute().data
-            )
-        else:
-            st.warning("No order data available for daily insights.")
-
-    # Placeholder for future expansions
-    with st.expander("🔍 More Insights (Coming Soon)", expanded=False):
-        st.info("More analytical features will be added here in the future.")
+    # ---------- On-demand Sections ----------
+    # Unlike st.expander, nothing runs for a section until it is opened here
+    selected = st.radio(
+        "Open section", ["Overview only"] + list(SECTIONS), horizontal=True, key="analytics_section"
+    )
+    if selected != "Overview only":
+        SECTIONS[selected]()
@@ -1,6 +1,6 @@
 import streamlit as st
-from src.supabase_client import supabase
-from src.models.food_item import FoodItem
+from src.supabase_client import get_client
+from src.data.catalog import catalog
 from src.widgets.food_card import render_food_card
 from src.widgets.add_item_form import render_add_item_form 
 
@@ -11,9 +11,8 @@ def show():
 
     st.title("📋 FlavorFleet Menu Management")
 
-    # Fetch categories
-    categories_data = supabase.table("categories").select("*").execute()
-    categories = categories_data.data
+    # Categories from the in-process menu catalog
+    categories = catalog.category_list()
 
     if not categories:
         st.warning("⚠️ No categories found.")
@@ -33,7 +32,8 @@ def show():
                 if new_category_name.lower() in existing_names:
                     st.warning("Category already exists.")
                 else:
-                    supabase.table("categories").insert({"name": new_category_name.strip()}).execute()
+                    result = get_client().table("categories").insert({"name": new_category_name.strip()}).execute()
+                    catalog.put_categories(result.data)
                     st.success(f"✅ Added category '{new_category_name}'")
                     st.rerun()
 
@@ -41,9 +41,9 @@ def show():
     selected_category = st.selectbox("🍽️ Select Food Category", category_names)
     selected_category_id = category_map[selected_category]
 
-    # Fetch food items for selected category
-    foods_data = supabase.table("foods").select("*").eq("category_id", selected_category_id).execute()
-    food_items = [FoodItem.from_dict(f) for f in foods_data.data]
+    # Food items and their add-ons for the selected category
+    food_items = catalog.foods_in(selected_category_id)
+    addons_by_food = catalog.addons_by_food()
 
     st.subheader(f"🍛 Items in '{selected_category}'")
 
@@ -63,7 +63,8 @@ def show():
 
             if confirm:
                 try:
-                    supabase.table("categories").delete().eq("id", selected_category_id).execute()
+                    get_client().table("categories").delete().eq("id", selected_category_id).execute()
+                    catalog.drop_category(selected_category_id)
                     st.success(f"✅ Deleted category '{selected_category}'")
                     st.session_state.confirm_delete_category = False
                     st.rerun()
@@ -73,7 +74,7 @@ def show():
     else:
         for item in food_items:
             with st.container():
-                render_food_card(item)
+                render_food_card(item, addons_by_food.get(item.id, []))
 
     # Divider & Add Food Button
     st.markdown("---")
@@ -1,10 +1,113 @@
-from supabase import create_client
+import importlib.util
 import os
+import random
+import threading
+import time
 from dotenv import load_dotenv
+from src.metrics import instrument, note_transport
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+# Transport tuning: one pooled, keep-alive connection set shared by PostgREST and storage
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_CONNECT_TIMEOUT_SECONDS", "5"))
+READ_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "30"))
+MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+KEEPALIVE_SECONDS = float(os.getenv("SUPABASE_KEEPALIVE_SECONDS", "60"))
+
+# Idempotent reads (GET/HEAD) are retried on connection errors and 429/5xx
+# with exponential backoff plus jitter
+READ_RETRIES = int(os.getenv("SUPABASE_READ_RETRIES", "3"))
+RETRY_BASE_SECONDS = 0.2
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# HTTP/2 multiplexes concurrent requests over one connection when h2 is installed
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+_client = None
+_client_lock = threading.Lock()
+_stats = {"requests": 0, "connections": 0, "tls_handshakes": 0, "retries": 0}
+_stats_lock = threading.Lock()
+
+
+# Process-wide totals, also noted on the call in flight so its query event
+# shows whether it reused a connection
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+    note_transport(name, n)
+
+
+# Requests sent vs connections opened; reused = requests that skipped TCP/TLS setup
+def transport_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["reused"] = max(0, stats["requests"] - stats["connections"])
+    return stats
+
+
+def _make_transport():
+    import httpx
+
+    class RetryTransport(httpx.HTTPTransport):
+        def handle_request(self, request):
+            request.extensions["trace"] = self._trace
+            retries = READ_RETRIES if request.method in ("GET", "HEAD") else 0
+            for attempt in range(retries + 1):
+                _count("requests")
+                try:
+                    response = super().handle_request(request)
+                except httpx.TransportError:
+                    if attempt == retries:
+                        raise
+                else:
+                    if response.status_code not in RETRY_STATUSES or attempt == retries:
+                        return response
+                    response.close()
+                _count("retries")
+                time.sleep(RETRY_BASE_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5))
+
+        # httpcore trace hook: count new connections and TLS handshakes
+        @staticmethod
+        def _trace(event, info):
+            if event == "connection.connect_tcp.complete":
+                _count("connections")
+            elif event == "connection.start_tls.complete":
+                _count("tls_handshakes")
+
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_SECONDS,
+    )
+    return httpx.Client(
+        transport=RetryTransport(http2=HTTP2, limits=limits),
+        timeout=httpx.Timeout(READ_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+        http2=HTTP2,
+        follow_redirects=True,
+    )
+
+
+def _create():
+    # FAKE_SUPABASE=1 swaps in the in-memory stand-in with synthetic data (src/offline)
+    if os.getenv("FAKE_SUPABASE"):
+        from src.offline.client import FakeSupabase
+        return FakeSupabase.from_env()
+
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
+    options = SyncClientOptions(httpx_client=_make_transport(), postgrest_client_timeout=READ_TIMEOUT_SECONDS)
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
+
+
+# The shared (instrumented) client, built on first use so importing this
+# module is cheap and configuration errors surface where data is requested
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = instrument(_create())
+    return _client
@@ -1,6 +1,7 @@
 import streamlit as st
 import re, uuid, tempfile, os
-from src.supabase_client import supabase
+from src.supabase_client import get_client
+from src.data.catalog import catalog
 
 def render_add_item_form(selected_category: str, selected_category_id: int):
     st.subheader("➕ Add New Food Item")
@@ -57,25 +58,27 @@ def render_add_item_form(selected_category: str, selected_category_id: int):
                     tmp.write(image_file.read())
                     tmp_path = tmp.name
 
-                supabase.storage.from_("food-images").upload(path=path, file=tmp_path, file_options={"content-type": image_file.type})
+                get_client().storage.from_("food-images").upload(path=path, file=tmp_path, file_options={"content-type": image_file.type})
                 os.remove(tmp_path)
 
-                image_url = supabase.storage.from_("food-images").get_public_url(path)
-                result = supabase.table("foods").insert({
+                image_url = get_client().storage.from_("food-images").get_public_url(path)
+                result = get_client().table("foods").insert({
                     "name": name, "price": price, "description": description,
                     "available": available, "image_url": image_url, "category_id": selected_category_id
                 }).execute()
 
                 food_id = result.data[0]["id"]
+                catalog.put_foods(result.data)
 
                 if st.session_state.use_addons:
                     for addon_name, addon_price in addon_inputs:
                         if addon_name.strip():
-                            supabase.table("addons").insert({
+                            addon_result = get_client().table("addons").insert({
                                 "food_id": food_id,
                                 "name": addon_name.strip(),
                                 "price": addon_price
                             }).execute()
+                            catalog.put_addons(addon_result.data)
 
                 st.success("✅ Food item and add-ons added successfully.")
                 st.session_state["show_add_item_form"] = False
@@ -0,0 +1,80 @@
+import streamlit as st
+import altair as alt
+import pandas as pd
+from src.metrics import altair_chart, span
+
+TOP_CUSTOMERS = 50
+
+# `index` is the shared CustomerIndex, already refreshed; its views are built once per refresh
+def render_customer_insights(index, catalog):
+    with span("customer_insights", "compute"):
+        customers = index.rfm()
+        retention = index.retention()
+
+    if customers.empty:
+        st.info("No customers yet.")
+        return
+
+    foods = catalog["foods"].set_index("id")["name"]
+    categories = catalog["categories"].set_index("id")["name"]
+
+    # ---------------- 👥 Overview ----------------
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("👥 Customers", f"{len(customers):,}")
+    with col2:
+        st.metric("🔁 Repeat Customers", f"{(customers['orders'] > 1).mean():.1%}")
+    with col3:
+        st.metric("💰 Avg Spend / Customer", f"₹ {customers['spend'].mean():,.2f}")
+    with col4:
+        st.metric("📦 Avg Orders / Customer", f"{customers['orders'].mean():.2f}")
+
+    def labelled(df):
+        df = df.reset_index()
+        return pd.DataFrame({
+            "Customer": df["user_id"],
+            "First Order": df["first_order"].dt.date,
+            "Last Order": df["last_order"].dt.date,
+            "Orders": df["orders"],
+            "Total Spend": df["spend"].round(2),
+            "Avg Spend": df["avg_spend"].round(2),
+            "Favourite Food": df["favourite_food_id"].map(foods),
+            "Favourite Category": df["favourite_category_id"].map(categories),
+            "RFM": df["R"].astype(str) + df["F"].astype(str) + df["M"].astype(str),
+        })
+
+    # ---------------- 🔎 Lookup ----------------
+    user_id = st.text_input("🔎 Look up a customer by user id", key="customer_lookup").strip()
+    if user_id:
+        if user_id in customers.index:
+            st.dataframe(labelled(customers.loc[[user_id]]), use_container_width=True, hide_index=True)
+        else:
+            st.warning(f"No orders found for {user_id}.")
+
+    # ---------------- 🏆 Top Customers ----------------
+    st.subheader(f"🏆 Top {TOP_CUSTOMERS} Customers by Spend")
+    st.caption("RFM = recency, frequency and monetary scores from 1 (lowest fifth) to 5 (highest fifth)")
+    st.dataframe(labelled(customers.head(TOP_CUSTOMERS)), use_container_width=True, hide_index=True)
+
+    # ---------------- 📈 Cohort Retention ----------------
+    st.subheader("📈 Cohort Retention by First-Order Month")
+    if retention.empty:
+        return
+    offsets = retention.drop(columns="customers")
+    cells = offsets.stack().rename("retention").reset_index()
+    cells.columns = ["cohort", "months_later", "retention"]
+    cells["cohort"] = cells["cohort"].dt.strftime("%Y-%m")
+    cells = cells.merge(
+        retention["customers"].rename(lambda p: p.strftime("%Y-%m")).rename_axis("cohort").reset_index(),
+        on="cohort",
+    )
+    altair_chart(
+        "customer_insights",
+        alt.Chart(cells).mark_rect().encode(
+            x=alt.X("months_later:O", title="Months Since First Order"),
+            y=alt.Y("cohort:O", title="First-Order Month"),
+            color=alt.Color("retention:Q", scale=alt.Scale(scheme="blues"), legend=alt.Legend(format="%")),
+            tooltip=["cohort", "customers", "months_later", alt.Tooltip("retention:Q", format=".1%")]
+        ).properties(height=max(250, 18 * len(offsets))),
+        use_container_width=True
+    )
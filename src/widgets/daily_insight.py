@@ -2,57 +2,68 @@ import streamlit as st
 import pandas as pd
 import altair as alt
 from datetime import datetime
+from src.data.repository import fetch_frame
+from src.data.rollups import addon_usage, fetch_cube, order_dates, slice_day
+from src.data.sketches import unique_users
+from src.metrics import span
 
-def render_daily_insights(orders, order_items, foods, addons, order_addons, categories):
+def render_daily_insights(foods, addons, categories, cube=None):
     st.set_page_config(page_title="📅 Daily Insights", layout="wide")
     st.title("📅 Daily Order Summary")
 
-    if not orders:
+    if cube is None:
+        cube = fetch_cube()
+
+    if cube["orders"].empty:
         st.warning("No order data available.")
         return
 
-    # Convert data
-    orders_df = pd.DataFrame(orders)
-    order_items_df = pd.DataFrame(order_items)
-    addons_df = pd.DataFrame(order_addons)
-    foods_df = pd.DataFrame(foods)
-    addon_defs_df = pd.DataFrame(addons)
-    categories_df = pd.DataFrame(categories)
-
-    orders_df["created_at"] = pd.to_datetime(orders_df["created_at"], format="ISO8601")
-    order_items_df["created_at"] = pd.to_datetime(order_items_df["created_at"], format="ISO8601")
+    foods_df = foods
+    addon_defs_df = addons
+    categories_df = categories
 
     # Date selection
-    unique_dates = sorted(orders_df["created_at"].dt.date.unique(), reverse=True)
-    selected_date = st.date_input("Select Date", value=unique_dates[0], min_value=min(unique_dates), max_value=max(unique_dates))
+    unique_dates = order_dates(cube)
+    selected_date = st.date_input("Select Date", value=unique_dates[0], min_value=unique_dates[-1], max_value=unique_dates[0])
 
-    # Filter by selected date
-    daily_orders = orders_df[orders_df["created_at"].dt.date == selected_date]
-    daily_items = order_items_df[order_items_df["created_at"].dt.date == selected_date]
-    daily_addons = addons_df[addons_df["order_item_id"].isin(daily_items["id"])] if not daily_items.empty else pd.DataFrame()
+    # Totals come from the cube; only the order list itself needs the day's raw rows
+    day_start = pd.Timestamp(selected_date)
+    day_end = day_start + pd.Timedelta(days=1)
+    with span("daily_insights", "compute"):
+        daily_totals = slice_day(cube, "orders", selected_date)
+        daily_items = slice_day(cube, "foods", selected_date)
+        daily_addons = slice_day(cube, "addons", selected_date)
+        daily_orders = fetch_frame("orders", start=day_start, end=day_end)
+
+    if daily_orders.empty:
+        st.info("No orders on this day.")
+        return
 
     st.subheader(f"📆 Summary for {selected_date.strftime('%A, %d %B %Y')}")
 
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("📦 Total Orders", len(daily_orders))
+        st.metric("📦 Total Orders", int(daily_totals["orders"].sum()))
     with col2:
-        st.metric("💰 Total Revenue", f"₹ {daily_orders['amount'].sum():,.2f}")
+        st.metric("💰 Total Revenue", f"₹ {daily_totals['revenue'].sum():,.2f}")
+    with col3:
+        # Exact for a single day (same cached orders as the table below)
+        st.metric("👥 Unique Customers", unique_users(day_start, day_end))
 
     # Category Filter
-    category_map = {row['id']: row['name'] for _, row in categories_df.iterrows()}
+    category_map = dict(zip(categories_df["id"], categories_df["name"]))
     selected_cat = st.selectbox("Filter by Category (optional)", ["All"] + list(category_map.values()))
 
     # Join food items for names
     if not daily_items.empty:
-        daily_items = daily_items.merge(foods_df, left_on="food_item_id", right_on="id", suffixes=("", "_food"))
+        daily_items = daily_items.merge(foods_df[["id", "name"]], left_on="food_item_id", right_on="id")
         if selected_cat != "All":
             cat_id = categories_df[categories_df.name == selected_cat].iloc[0].id
             daily_items = daily_items[daily_items["category_id"] == cat_id]
 
     # Table of Orders
     st.markdown("### 📋 Order Details")
-    order_table = daily_orders[["id", "user_id", "amount", "created_at"]].sort_values("created_at")
+    order_table = daily_orders[["id", "user_id", "amount", "created_at"]]
     st.dataframe(order_table, use_container_width=True, hide_index=True)
 
     # Top Food Items
@@ -66,8 +77,7 @@ def render_daily_insights(orders, order_items, foods, addons, order_addons, cate
     # Add-on Usage
     st.markdown("### 🧂 Add-ons Used")
     if not daily_addons.empty:
-        daily_addons = daily_addons.merge(addon_defs_df, left_on="addon_id", right_on="id")
-        addon_summary = daily_addons.groupby("name").size().reset_index(name="count").sort_values(by="count", ascending=False)
+        addon_summary = addon_usage(daily_addons, addon_defs_df)
         st.dataframe(addon_summary, use_container_width=True, hide_index=True)
     else:
         st.info("No add-ons used on this day.")
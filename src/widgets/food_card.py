@@ -1,17 +1,14 @@
 import streamlit as st
-from src.supabase_client import supabase
+from src.supabase_client import get_client
+from src.data.catalog import catalog
 from src.models.food_item import FoodItem
 from src.models.addOn import AddOn
 from urllib.parse import urlparse
 
-def render_food_card(item: FoodItem):
+def render_food_card(item: FoodItem, addons: list[AddOn]):
     edit_key = f"edit_{item.id}"
     is_editing = st.session_state.get(edit_key, False)
 
-    # Fetch Add-ons for this food item
-    addons_data = supabase.table("addons").select("*").eq("food_id", item.id).execute()
-    addons = [AddOn.from_dict(a) for a in addons_data.data] if addons_data.data else []
-
     if not is_editing:
         with st.container():
             cols = st.columns([1, 3, 1])
@@ -46,12 +43,13 @@ def render_food_card(item: FoodItem):
                         image_path = "/".join(path_parts[5:])  # path after /storage/v1/object/public/<bucket-name>/
 
                         try:
-                            supabase.storage.from_("food-images").remove([image_path])  # <-- pass as list!
+                            get_client().storage.from_("food-images").remove([image_path])  # <-- pass as list!
                         except Exception as e:
                             st.warning(f"⚠️ Failed to remove image: {e}")
 
                     # Delete the food item
-                    supabase.table("foods").delete().eq("id", item.id).execute()
+                    get_client().table("foods").delete().eq("id", item.id).execute()
+                    catalog.drop_food(item.id)
                     st.success(f"Deleted {item.name}")
                     st.rerun()
 
@@ -70,15 +68,17 @@ def render_food_card(item: FoodItem):
                 cols = st.columns([1, 1])
                 with cols[0]:
                     if st.form_submit_button(f"💾 Save Add-on {addon.name}"):
-                        supabase.table("addons").update({
+                        result = get_client().table("addons").update({
                             "name": addon_name,
                             "price": addon_price
                         }).eq("id", addon.id).execute()
+                        catalog.put_addons(result.data)
                         st.success(f"Updated add-on '{addon.name}'")
                         st.rerun()
                 with cols[1]:
                     if st.form_submit_button(f"🗑️ Delete Add-on {addon.name}"):
-                        supabase.table("addons").delete().eq("id", addon.id).execute()
+                        get_client().table("addons").delete().eq("id", addon.id).execute()
+                        catalog.drop_addon(addon.id)
                         st.warning(f"Deleted add-on '{addon.name}'")
                         st.rerun()
 
@@ -87,11 +87,12 @@ def render_food_card(item: FoodItem):
             new_addon_price = st.number_input("New Add-on Price (₹)", min_value=0.0, step=0.5, key=f"new_addon_price_{item.id}")
             if st.form_submit_button("Add Add-on"):
                 if new_addon_name.strip():
-                    supabase.table("addons").insert({
+                    result = get_client().table("addons").insert({
                         "food_id": item.id,
                         "name": new_addon_name,
                         "price": new_addon_price
                     }).execute()
+                    catalog.put_addons(result.data)
                     st.success(f"Added add-on '{new_addon_name}'")
                     st.rerun()
                 else:
@@ -102,12 +103,13 @@ def render_food_card(item: FoodItem):
             col_save, col_cancel = st.columns(2)
             with col_save:
                 if st.form_submit_button("💾 Save Item"):
-                    supabase.table("foods").update({
+                    result = get_client().table("foods").update({
                         "name": new_name,
                         "description": new_description,
                         "price": new_price,
                         "available": new_available
                     }).eq("id", item.id).execute()
+                    catalog.put_foods(result.data)
                     st.success("Updated successfully")
                     st.session_state[edit_key] = False
                     st.rerun()
@@ -0,0 +1,39 @@
+import streamlit as st
+import altair as alt
+from src.data.frames import WEEKDAYS
+from src.data.live import LIVE_REFRESH_SECONDS
+from src.metrics import altair_chart
+
+# `stats` is a snapshot from live.refresh(), which fetched only rows added since the previous poll
+def render_live_dashboard(stats, foods):
+    st.caption(f"🔴 Live · updated {stats['updated_at']:%H:%M:%S} UTC · refreshes every {LIVE_REFRESH_SECONDS}s")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📦 Orders Today", stats["orders"])
+    with col2:
+        st.metric("💰 Revenue Today", f"₹ {stats['revenue']:,.2f}")
+    with col3:
+        st.metric("🧂 Add-ons Today", stats["addons"])
+
+    # ---------------- ⏰ Weekday × Hour ----------------
+    st.subheader("⏱️ Order Frequency Heatmap (Weekday × Hour)")
+    altair_chart(
+        "live_dashboard",
+        alt.Chart(stats["heatmap"]).mark_rect().encode(
+            x=alt.X("hour:O", title="Hour of Day"),
+            y=alt.Y("weekday:N", title="Weekday", sort=WEEKDAYS),
+            color=alt.Color("orders:Q", scale=alt.Scale(scheme="greens")),
+            tooltip=["weekday", "hour", "orders"]
+        ).properties(height=350),
+        use_container_width=True
+    )
+
+    # ---------------- 🍽️ Top Items Today ----------------
+    st.subheader("🍽️ Top Items Today")
+    top_foods = stats["top_foods"]
+    if not top_foods.empty:
+        top_foods = top_foods.merge(foods[["id", "name"]], left_on="food_item_id", right_on="id")
+        st.dataframe(top_foods[["name", "quantity"]], use_container_width=True, hide_index=True)
+    else:
+        st.info("No items ordered yet today.")
@@ -1,65 +1,74 @@
 import streamlit as st
-from src.supabase_client import supabase
+from src.data.catalog import fetch_catalog
+from src.data.frames import SHIFTS
+from src.data.rollups import addon_usage, fetch_cube, month_rows, order_months
+from src.data.sketches import counts_exactly, fetch_user_sketches, unique_users
+from src.metrics import altair_chart, span
 import pandas as pd
 import altair as alt
 from datetime import datetime
 
-# Fetching functions
-def fetch_all():
-    return {
-        "orders": supabase.table("orders").select("*").execute().data,
-        "order_items": supabase.table("order_items").select("*").execute().data,
-        "addons": supabase.table("order_item_addons").select("*").execute().data,
-        "foods": supabase.table("foods").select("id, name, category_id").execute().data,
-        "categories": supabase.table("categories").select("id, name").execute().data,
-        "addon_defs": supabase.table("addons").select("id, name").execute().data
-    }
-
-def show():
+def show(catalog=None, cube=None, sketches=None):
     st.set_page_config(page_title="📆 Monthly Summary", layout="wide")
 
-    data = fetch_all()
-    
-    orders_df = pd.DataFrame(data["orders"])
-    items_df = pd.DataFrame(data["order_items"])
-    addons_df = pd.DataFrame(data["addons"])
-    foods_df = pd.DataFrame(data["foods"])
-    categories_df = pd.DataFrame(data["categories"])
-    addon_defs_df = pd.DataFrame(data["addon_defs"])
-
-    # Preprocess datetime
-    for df in [orders_df, items_df]:
-        if not df.empty:
-            df["created_at"] = pd.to_datetime(df["created_at"], format="ISO8601")
+    if catalog is None:
+        catalog = fetch_catalog()
+    if cube is None:
+        cube = fetch_cube()
+    if sketches is None:
+        sketches = fetch_user_sketches()
+
+    foods_df = catalog["foods"]
+    categories_df = catalog["categories"]
+    addon_defs_df = catalog["addons"]
 
     # Month selector
-    if orders_df.empty:
+    available_months = order_months(cube)
+    if not available_months:
         st.warning("No orders available.")
         return
 
-    orders_df["month"] = orders_df["created_at"].dt.to_period("M")
-    available_months = sorted(orders_df["month"].unique(), reverse=True)
     selected_month = st.selectbox("Select Month", available_months)
 
-    # Filter data by month
-    month_orders = orders_df[orders_df["month"] == selected_month]
-    month_items = items_df[items_df["created_at"].dt.to_period("M") == selected_month]
+    # Every month's results are precomputed on the cube; this is just a lookup
+    with span("monthly_summary", "compute"):
+        monthly = cube["monthly"]
+        month_stats = monthly["summary"].loc[selected_month]
+        month_foods = month_rows(monthly["foods"], selected_month)
+        month_categories = month_rows(monthly["categories"], selected_month)
+        month_addons = month_rows(monthly["addons"], selected_month)
+        # Merged per-day HyperLogLog sketches unless months are short enough to count exactly
+        month_range = (selected_month.start_time, (selected_month + 1).start_time)
+        month_users = unique_users(*month_range, sketches=sketches)
     
     st.subheader(f"📊 Summary for {selected_month.strftime('%B %Y')}")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("💰 Monthly Revenue", f"₹ {month_orders['amount'].sum():,.2f}")
+        st.metric("💰 Monthly Revenue", f"₹ {month_stats['revenue']:,.2f}")
     with col2:
-        st.metric("📦 Total Orders", len(month_orders))
+        st.metric("📦 Total Orders", int(month_stats["orders"]))
+    with col3:
+        st.metric("👥 Unique Customers", f"{month_users:,}" if counts_exactly(*month_range) else f"≈ {month_users:,}")
+
+    # Month-over-Month Trend
+    trend = monthly["summary"].reset_index()
+    trend = trend[["revenue", "orders"]].assign(month=trend["month"].dt.to_timestamp())
+    altair_chart(
+        "monthly_summary",
+        alt.Chart(trend).mark_line(point=True).encode(
+            x=alt.X("month:T", title="Month"),
+            y=alt.Y("revenue:Q", title="Revenue (₹)"),
+            tooltip=[alt.Tooltip("month:T", format="%B %Y"), "revenue", "orders"]
+        ).properties(height=200), use_container_width=True
+    )
 
     # Top Food Item
     st.markdown("---")
     st.subheader("🥇 Most Ordered Item")
-    if not month_items.empty and not foods_df.empty:
-        merged = month_items.merge(foods_df, left_on="food_item_id", right_on="id")
-        top_item = merged.groupby("name")["quantity"].sum().reset_index().sort_values(by="quantity", ascending=False).head(1)
-        row = top_item.iloc[0]
-        st.success(f"**{row['name']}** with **{int(row['quantity'])}** orders")
+    if pd.notna(month_stats["top_food_id"]) and not foods_df.empty:
+        top_name = foods_df.loc[foods_df["id"] == month_stats["top_food_id"], "name"]
+        if not top_name.empty:
+            st.success(f"**{top_name.iloc[0]}** with **{int(month_stats['top_food_quantity'])}** orders")
 
     # Day vs Night Sales and Category-wise Orders
     st.markdown("---")
@@ -68,17 +77,19 @@ def show():
     # 🌞 Day vs 🌙 Night Sales
     with col1:
         st.subheader("🌞 Day vs 🌙 Night Sales")
-        if not month_orders.empty:
-            def get_period(hour):
-                return "Night" if hour < 6 or hour >= 18 else "Day"
-
-            month_orders["period"] = month_orders["created_at"].dt.hour.apply(get_period)
-            period_stats = month_orders.groupby("period")["amount"].sum().reset_index()
-
-            # Calculate percentage and formatted label
-            total_amount = period_stats["amount"].sum()
-            period_stats["percent"] = period_stats["amount"] / total_amount * 100
-            period_stats["label"] = period_stats["period"] + " (" + period_stats["percent"].round(1).astype(str) + "%)"
+        if month_stats["revenue"] > 0:
+            period_stats = pd.DataFrame({
+                "period": ["Day", "Night"],
+                "amount": [month_stats["day_revenue"], month_stats["night_revenue"]],
+            })
+            period_stats = period_stats[period_stats["amount"] > 0]
+
+            # Calculate percentage and formatted label (assign, not setitem: period_stats is a filtered view)
+            percent = period_stats["amount"] / period_stats["amount"].sum() * 100
+            period_stats = period_stats.assign(
+                percent=percent,
+                label=period_stats["period"] + " (" + percent.round(1).astype(str) + "%)"
+            )
 
             pie_chart = alt.Chart(period_stats).mark_arc(innerRadius=50).encode(
                 theta=alt.Theta(field="amount", type="quantitative"),
@@ -86,22 +97,16 @@ def show():
                 tooltip=["period", "amount", alt.Tooltip("percent:Q", format=".1f")]
             ).properties(height=350, width=350)
 
-            st.altair_chart(pie_chart, use_container_width=True)
+            altair_chart("monthly_summary", pie_chart, use_container_width=True)
         else:
             st.info("No order data available.")
 
     # 📂 Orders by Category
     with col2:
         st.subheader("📂 Orders by Category")
-        if not month_items.empty and not foods_df.empty and not categories_df.empty:
-            # Merge items with food and category data
-            merged = month_items.merge(foods_df, left_on="food_item_id", right_on="id")
-            merged = merged.merge(categories_df, left_on="category_id", right_on="id", suffixes=('', '_cat'))
-            category_orders = merged.groupby("name_cat")["quantity"].sum().reset_index()
-
-            # Calculate percentage
-            total_quantity = category_orders["quantity"].sum()
-            category_orders["percent"] = category_orders["quantity"] / total_quantity * 100
+        if not month_categories.empty and not categories_df.empty:
+            # Quantities and percentages are precomputed per month; only names are attached here
+            category_orders = month_categories.merge(categories_df.rename(columns={"name": "name_cat"}), left_on="category_id", right_on="id")
             category_orders["label"] = category_orders["name_cat"] + " (" + category_orders["percent"].round(1).astype(str) + "%)"
 
             cat_pie = alt.Chart(category_orders).mark_arc(innerRadius=50).encode(
@@ -110,10 +115,26 @@ def show():
                 tooltip=["name_cat", "quantity", alt.Tooltip("percent:Q", format=".1f")]
             ).properties(height=350, width=350)
 
-            st.altair_chart(cat_pie, use_container_width=True)
+            altair_chart("monthly_summary", cat_pie, use_container_width=True)
         else:
             st.info("No category data available.")
 
+    # 🕐 Revenue by Shift (boundaries from SHIFT_BOUNDARIES)
+    st.markdown("---")
+    st.subheader("🕐 Revenue by Shift")
+    month_shifts = month_rows(monthly["shifts"], selected_month)
+    if not month_shifts.empty:
+        altair_chart(
+            "monthly_summary",
+            alt.Chart(month_shifts).mark_bar().encode(
+                x=alt.X("shift:N", sort=[label for label, _ in SHIFTS], title="Shift"),
+                y=alt.Y("revenue:Q", title="Revenue (₹)"),
+                tooltip=["shift", "orders", "revenue"]
+            ).properties(height=300), use_container_width=True
+        )
+    else:
+        st.info("No order data available.")
+
     # Category MVP
     st.markdown("---")
     st.subheader("🏆 Category MVP")
@@ -124,10 +145,11 @@ def show():
 
         # Find items from this category
         category_items = foods_df[foods_df.category_id == selected_cat_id]
-        if not category_items.empty:
-            merged = month_items.merge(category_items, left_on="food_item_id", right_on="id")
+        if not category_items.empty and not month_foods.empty:
+            merged = month_foods.merge(category_items[["id", "name"]], left_on="food_item_id", right_on="id")
             top_cat_items = merged.groupby("name")["quantity"].sum().reset_index().sort_values(by="quantity", ascending=False).head(5)
-            st.altair_chart(
+            altair_chart(
+                "monthly_summary",
                 alt.Chart(top_cat_items).mark_bar().encode(
                     x="quantity:Q",
                     y=alt.Y("name:N", sort="-x"),
@@ -139,18 +161,18 @@ def show():
 
 
 
-    # Total Add-ons Used
+    # Add-ons Used in the selected month
     st.markdown("---")
     st.subheader("🧂 Add-on Usage")
-    if not addons_df.empty:
-        merged_addons = addons_df.merge(addon_defs_df, left_on="addon_id", right_on="id")
-        addon_usage = merged_addons.groupby("name").size().reset_index(name="count").sort_values(by="count", ascending=False).head(10)
-        st.altair_chart(
-            alt.Chart(addon_usage).mark_bar().encode(
+    if not month_addons.empty:
+        top_addons = addon_usage(month_addons, addon_defs_df, limit=10)
+        altair_chart(
+            "monthly_summary",
+            alt.Chart(top_addons).mark_bar().encode(
                 x="count:Q",
                 y=alt.Y("name:N", sort="-x"),
                 tooltip=["name", "count"]
             ).properties(height=350), use_container_width=True
         )
-
-    
\ No newline at end of file
+    else:
+        st.info("No add-ons used in the selected month.")
@@ -0,0 +1,48 @@
+import streamlit as st
+import pandas as pd
+from src.data.export import EXPORT_CHUNK_ORDERS, EXPORT_UI_MAX_DAYS, MIME_TYPES, export_file
+
+DEFAULT_DAYS = 7
+
+# `dates` are the days with orders, newest first (see rollups.order_dates)
+def render_order_export(dates):
+    st.subheader("📤 Export Order Data")
+    if not dates:
+        st.warning("No orders available.")
+        return
+
+    st.caption(
+        f"One row per order → item → add-on, with food and category names. "
+        f"Built {EXPORT_CHUNK_ORDERS:,} orders at a time when you click Download; the finished file "
+        f"is held in the server's memory until it is downloaded, so large ranges belong in the CLI "
+        f"(`python -m src.data.export`)."
+    )
+    newest, oldest = dates[0], dates[-1]
+    selected = st.date_input(
+        "Date range",
+        value=(max(oldest, newest - pd.Timedelta(days=DEFAULT_DAYS - 1)), newest),
+        min_value=oldest,
+        max_value=newest,
+        key="export_range",
+    )
+    if len(selected) != 2:
+        st.info("Select an end date.")
+        return
+    fmt = st.radio("Format", list(MIME_TYPES), format_func=str.upper, horizontal=True, key="export_format")
+
+    first, last = selected
+    start = pd.Timestamp(first, tz="UTC")
+    end = pd.Timestamp(last, tz="UTC") + pd.Timedelta(days=1)
+    if EXPORT_UI_MAX_DAYS and (end - start).days > EXPORT_UI_MAX_DAYS:
+        st.warning(
+            f"Downloads are limited to {EXPORT_UI_MAX_DAYS} days. Export longer ranges from the command line:\n\n"
+            f"`python -m src.data.export --start {first} --end {last + pd.Timedelta(days=1)} --format {fmt} --out orders.{fmt}`"
+        )
+        return
+    # Deferred: the export only runs (on a worker thread) once the button is clicked
+    st.download_button(
+        "⬇️ Download",
+        data=lambda: export_file(start, end, fmt),
+        file_name=f"flavorfleet_orders_{first}_{last}.{fmt}",
+        mime=MIME_TYPES[fmt],
+    )
@@ -0,0 +1,58 @@
+import json
+import streamlit as st
+import pandas as pd
+from src import metrics
+from src.data.repository import cache_stats
+from src.supabase_client import transport_stats
+
+# Sidebar breakdown of the last rerun: Supabase calls and widget timings
+def render_performance_panel():
+    events = metrics.current_run()
+    queries = pd.DataFrame(
+        [e for e in events if e["kind"] == "query"],
+        columns=["source", "filters", "ms", "rows", "bytes", "reused", "tls_handshake"],
+    )
+    renders = pd.DataFrame([e for e in events if e["kind"] == "render"], columns=["widget", "stage", "ms"])
+
+    with st.sidebar.expander("⏱️ Performance"):
+        col1, col2 = st.columns(2)
+        col1.metric("Queries", len(queries))
+        col2.metric("Query time", f"{queries['ms'].sum():,.0f} ms")
+        col1.metric("Rows", f"{int(queries['rows'].sum()):,}")
+        col2.metric("Received", f"{queries['bytes'].sum() / 1024:,.0f} KB")
+
+        if not queries.empty:
+            st.markdown("**Supabase calls**")
+            # reused / tls_handshake come from the HTTP transport; the offline stand-in has none
+            st.dataframe(queries.round({"ms": 1}).dropna(axis=1, how="all"), hide_index=True)
+
+        if not renders.empty:
+            st.markdown("**Widgets**")
+            by_stage = renders.groupby(["widget", "stage"], sort=False)["ms"].sum().round(1).reset_index()
+            st.dataframe(by_stage, hide_index=True)
+
+        pages = pd.DataFrame([e for e in metrics.history if e["kind"] == "page"], columns=["page", "queries", "bytes"])
+        if not pages.empty:
+            st.markdown("**Page loads** (all sessions)")
+            by_page = pages.groupby("page").agg(loads=("queries", "size"), queries=("queries", "mean"), bytes=("bytes", "mean"))
+            by_page["KB / load"] = (by_page.pop("bytes") / 1024).round(1)
+            st.dataframe(by_page.round({"queries": 1}))
+
+        cache = cache_stats()
+        st.caption(
+            f"Shared cache: {cache['entries']} entries, {cache['bytes'] / 2**20:,.1f} MB, "
+            f"{cache['hits']} hits, {cache['misses']} misses, {cache['coalesced']} coalesced, {cache['evictions']} evicted"
+        )
+        transport = transport_stats()
+        if transport["requests"]:
+            st.caption(
+                f"HTTP: {transport['requests']} requests over {transport['connections']} connections "
+                f"({transport['reused']} reused, {transport['tls_handshakes']} TLS handshakes, {transport['retries']} retries)"
+            )
+
+        st.download_button(
+            "Export (JSON lines)",
+            "\n".join(json.dumps(e, default=str) for e in events),
+            file_name="rerun-metrics.jsonl",
+        )
+        st.download_button("Export (Prometheus)", metrics.prometheus_text(), file_name="flavorfleet.prom")
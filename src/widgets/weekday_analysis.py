@@ -1,63 +1,68 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
+from src.data.frames import WEEKDAYS
+from src.data.rollups import fetch_cube, month_rows, order_months
+from src.data.sketches import counts_exactly, fetch_user_sketches, unique_users
+from src.metrics import altair_chart, span
 
-def render_weekday_analysis(orders, order_items, foods, addons, order_addons):
+def render_weekday_analysis(cube=None, sketches=None):
     st.set_page_config(page_title="📅 Weekday Analytics", layout="wide")
 
-    if not orders:
+    if cube is None:
+        cube = fetch_cube()
+    if sketches is None:
+        sketches = fetch_user_sketches()
+
+    available_months = order_months(cube)
+    if not available_months:
         st.warning("No order data available.")
         return
 
-    # Convert to DataFrame
-    orders_df = pd.DataFrame(orders)
-    order_items_df = pd.DataFrame(order_items)
-    addons_df = pd.DataFrame(order_addons)
-    foods_df = pd.DataFrame(foods)
-    addon_defs_df = pd.DataFrame(addons)
-
-    # Process datetime
-    orders_df["created_at"] = pd.to_datetime(orders_df["created_at"], format="ISO8601")
-    orders_df["weekday"] = orders_df["created_at"].dt.day_name()
-    orders_df["hour"] = orders_df["created_at"].dt.hour
-    orders_df["month"] = orders_df["created_at"].dt.to_period("M")
-
-    weekday_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    weekday_order = WEEKDAYS
 
     # Toggle: Overall vs Monthly
+    # Precomputed (month, weekday, hour) totals; overall just sums across months
+    weekday_hours = cube["monthly"]["weekday_hours"]
     toggle_mode = st.radio("Select Analysis Scope:", ["Overall", "Monthly"], horizontal=True)
     if toggle_mode == "Monthly":
-        available_months = sorted(orders_df["month"].unique(), reverse=True)
         selected_month = st.selectbox("Select Month", available_months, key="weekday_month_select")
-        orders_df = orders_df[orders_df["month"] == selected_month]
+        stats_df = month_rows(weekday_hours, selected_month)
+        user_range = (selected_month.start_time, (selected_month + 1).start_time)
         st.subheader(f"📊 Analysis for {selected_month.strftime('%B %Y')}")
     else:
+        stats_df = weekday_hours
+        user_range = (None, None)
         st.subheader("📊 Overall Weekday Analysis")
 
     # ---------------- 📦 Orders per Weekday ----------------
     st.subheader("📦 Orders & Revenue by Weekday")
-    order_counts = orders_df.groupby("weekday").size().reset_index(name="orders")
-    revenue_stats = orders_df.groupby("weekday")["amount"].sum().reset_index(name="revenue")
-    merged = order_counts.merge(revenue_stats, on="weekday")
-    merged["weekday"] = pd.Categorical(merged["weekday"], categories=weekday_order, ordered=True)
-    merged = merged.sort_values("weekday")
-    merged["avg_order_value"] = merged["revenue"] / merged["orders"]
+    # "weekday" is an ordered categorical on the cube, so groups come out Monday first
+    with span("weekday_analysis", "compute"):
+        merged = stats_df.groupby("weekday", observed=True)[["orders", "revenue"]].sum().reset_index()
+        merged["avg_order_value"] = merged["revenue"] / merged["orders"]
+        # Distinct customers per weekday, from the merged daily sketches for long ranges
+        merged["unique_users"] = [
+            unique_users(*user_range, weekday=WEEKDAYS.index(day), sketches=sketches) for day in merged["weekday"]
+        ]
+    users_title = "unique customers" if counts_exactly(*user_range) else "unique customers (≈)"
 
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("#### Number of Orders")
-        st.altair_chart(
+        altair_chart(
+            "weekday_analysis",
             alt.Chart(merged).mark_bar().encode(
                 x=alt.X("weekday:N", sort=weekday_order),
                 y="orders:Q",
-                tooltip=["weekday", "orders"]
+                tooltip=["weekday", "orders", alt.Tooltip("unique_users:Q", title=users_title)]
             ).properties(height=300),
             use_container_width=True
         )
 
     with col2:
         st.markdown("#### Revenue per Weekday")
-        st.altair_chart(
+        altair_chart(
+            "weekday_analysis",
             alt.Chart(merged).mark_bar().encode(
                 x=alt.X("weekday:N", sort=weekday_order),
                 y="revenue:Q",
@@ -68,7 +73,8 @@ def render_weekday_analysis(orders, order_items, foods, addons, order_addons):
 
     # ---------------- 📊 Average Order Value ----------------
     st.markdown("#### 💵 Average Order Value per Day")
-    st.altair_chart(
+    altair_chart(
+        "weekday_analysis",
         alt.Chart(merged).mark_line(point=True).encode(
             x=alt.X("weekday:N", sort=weekday_order),
             y="avg_order_value:Q",
@@ -81,8 +87,8 @@ def render_weekday_analysis(orders, order_items, foods, addons, order_addons):
     st.markdown("---")
     st.subheader("⏱️ Order Frequency Heatmap (Weekday × Hour)")
 
-    heatmap_data = orders_df.groupby(["weekday", "hour"]).size().reset_index(name="orders")
-    heatmap_data["weekday"] = pd.Categorical(heatmap_data["weekday"], categories=weekday_order, ordered=True)
+    with span("weekday_analysis", "compute"):
+        heatmap_data = stats_df.groupby(["weekday", "hour"], observed=True)["orders"].sum().reset_index()
 
     heatmap = alt.Chart(heatmap_data).mark_rect().encode(
         x=alt.X("hour:O", title="Hour of Day"),
@@ -91,4 +97,4 @@ def render_weekday_analysis(orders, order_items, foods, addons, order_addons):
         tooltip=["weekday", "hour", "orders"]
     ).properties(height=350)
 
-    st.altair_chart(heatmap, use_container_width=True)
+    altair_chart("weekday_analysis", heatmap, use_container_width=True)
@@ -0,0 +1,23 @@
+import pytest
+from src import supabase_client
+from src.data.catalog import catalog
+from src.data.repository import invalidate
+from src.offline.client import FakeSupabase
+from src.offline.data import generate
+
+
+# An offline stand-in installed as the shared client, with every cache cleared
+# around the test. Call it with a scale, optionally the days of history, and
+# FakeSupabase options.
+@pytest.fixture
+def fake_client(monkeypatch):
+    def install(scale="2000", days=365, **options):
+        client = FakeSupabase(generate(scale, days=days), **options)
+        monkeypatch.setattr(supabase_client, "_client", client)
+        invalidate()
+        catalog.invalidate()
+        return client
+
+    yield install
+    invalidate()
+    catalog.invalidate()
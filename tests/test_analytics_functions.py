@@ -0,0 +1,93 @@
+import os
+import uuid
+import pandas as pd
+import pytest
+from src.offline.client import FakeSupabase
+from src.offline.data import generate
+
+# The SQL functions in sql/analytics_functions.sql against the pandas versions
+# in FakeSupabase.call, which the app and benchmarks run offline. Needs a
+# scratch Postgres and psycopg 3; every table lives in a throwaway schema:
+#   TEST_DATABASE_URL=postgresql://localhost/scratch python -m pytest tests/test_analytics_functions.py
+
+SQL_FILE = os.path.join(os.path.dirname(__file__), "..", "sql", "analytics_functions.sql")
+
+SCHEMA = {
+    "categories": "id bigint primary key, name text",
+    "foods": "id bigint primary key, name text, category_id bigint",
+    "orders": "id bigint primary key, user_id text, amount numeric, created_at timestamptz",
+    "order_items": "id bigint primary key, order_id bigint, food_item_id bigint, quantity int, price numeric, created_at timestamptz",
+    "order_item_addons": "id bigint primary key, order_item_id bigint, addon_id bigint",
+}
+
+# Bounds that split UTC days differently from the session TimeZone set below
+RANGES = [{}, {"start_ts": "2025-03-01T00:00:00+00:00", "end_ts": "2025-03-08T00:00:00+00:00"}]
+
+KEYS = ["day", "hour", "food_item_id", "category_id", "addon_id"]
+
+
+@pytest.fixture(scope="module")
+def db():
+    psycopg = pytest.importorskip("psycopg")
+    dsn = os.getenv("TEST_DATABASE_URL")
+    if not dsn:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    data = generate(2_000, days=30, end="2025-03-15")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        conn.execute(f"create schema {schema}")
+        try:
+            conn.execute(f"set search_path to {schema}")
+            # Days must come out in UTC whatever the session zone
+            conn.execute("set timezone to 'Asia/Kolkata'")
+            for table, columns in SCHEMA.items():
+                conn.execute(f"create table {table} ({columns})")
+                names = [c.split()[0] for c in columns.split(", ")]
+                with conn.cursor().copy(f"copy {table} ({', '.join(names)}) from stdin") as copy:
+                    for row in data[table][names].itertuples(index=False):
+                        copy.write_row(row)
+            with open(SQL_FILE) as f:
+                conn.execute(f.read())
+            yield conn, FakeSupabase(data)
+        finally:
+            conn.execute(f"drop schema {schema} cascade")
+
+
+def _sql(conn, name, params):
+    args = ", ".join(f"{k} => %({k})s::timestamptz" for k in params)
+    cur = conn.execute(f"select * from {name}({args})", params)
+    return pd.DataFrame(cur.fetchall(), columns=[c.name for c in cur.description])
+
+
+@pytest.mark.parametrize("params", RANGES)
+def test_order_totals(db, params):
+    conn, fake = db
+    got = _sql(conn, "order_totals", params).iloc[0]
+    want = fake.call("order_totals", params).iloc[0]
+    assert int(got["orders"]) == want["orders"]
+    assert float(got["revenue"]) == pytest.approx(want["revenue"])
+    assert int(got["unique_users"]) == want["unique_users"]
+    assert int(got["items_sold"]) == want["items_sold"]
+
+
+@pytest.mark.parametrize("params", RANGES)
+def test_order_rollup(db, params):
+    conn, fake = db
+    got = _sql(conn, "order_rollup", params)
+    want = fake.call("order_rollup", params)
+    got["day"] = got["day"].astype(str)
+    for df in (got, want):
+        for column in got.columns.drop("day"):
+            df[column] = pd.to_numeric(df[column]).astype("Float64")
+        df.sort_values(KEYS, na_position="first", inplace=True, ignore_index=True)
+    pd.testing.assert_frame_equal(got, want[got.columns], check_dtype=False)
+
+
+@pytest.mark.parametrize("params", RANGES)
+def test_user_sketches(db, params):
+    conn, fake = db
+    got = _sql(conn, "user_sketches", params).sort_values("day", ignore_index=True)
+    want = fake.call("user_sketches", params).sort_values("day", ignore_index=True)
+    assert got["day"].astype(str).tolist() == want["day"].astype(str).tolist()
+    assert got["registers"].tolist() == want["registers"].tolist()
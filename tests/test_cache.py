@@ -0,0 +1,146 @@
+import threading
+import numpy as np
+import pytest
+from src.data.cache import SharedCache
+
+
+# A loader that blocks until released, so tests control when a load finishes
+class Gate:
+    def __init__(self, value="fresh"):
+        self.value = value
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(10)
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+def in_thread(target):
+    result = {}
+
+    def run():
+        try:
+            result["value"] = target()
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+def wait_for_waiters(cache, n):
+    for _ in range(1000):
+        if cache.stats()["coalesced"] >= n:
+            return
+        threading.Event().wait(0.005)
+    pytest.fail("callers never joined the in-flight load")
+
+
+def test_concurrent_misses_share_one_load():
+    cache, load = SharedCache(ttl=60), Gate()
+    leader, first = in_thread(lambda: cache.get(("orders",), load))
+    assert load.started.wait(10)
+    waiters = [in_thread(lambda: cache.get(("orders",), load)) for _ in range(4)]
+    wait_for_waiters(cache, 4)
+    load.release.set()
+    for thread, _ in [(leader, first), *waiters]:
+        thread.join(10)
+    assert load.calls == 1
+    assert first["value"] == "fresh" and all(r["value"] == "fresh" for _, r in waiters)
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+    assert cache.get(("orders",), lambda: pytest.fail("reloaded")) == "fresh"
+
+
+def test_load_errors_reach_waiting_callers_and_are_not_cached():
+    cache, load = SharedCache(ttl=60), Gate(RuntimeError("timeout"))
+    leader, first = in_thread(lambda: cache.get(("orders",), load))
+    assert load.started.wait(10)
+    waiter, second = in_thread(lambda: cache.get(("orders",), load))
+    wait_for_waiters(cache, 1)
+    load.release.set()
+    leader.join(10)
+    waiter.join(10)
+    assert str(first["error"]) == str(second["error"]) == "timeout"
+    assert cache.get(("orders",), lambda: "retried") == "retried"
+
+
+@pytest.mark.parametrize("names", [("orders",), None])
+def test_invalidate_during_a_load_discards_its_result(names):
+    cache, stale = SharedCache(ttl=60), Gate("stale")
+    leader, first = in_thread(lambda: cache.get(("orders", "2025-06"), stale))
+    assert stale.started.wait(10)
+    cache.invalidate(names)
+    # Callers after the invalidation start their own load instead of waiting on the stale one
+    assert cache.get(("orders", "2025-06"), lambda: "fresh") == "fresh"
+    stale.release.set()
+    leader.join(10)
+    assert first["value"] == "stale"
+    assert cache.get(("orders", "2025-06"), lambda: pytest.fail("reloaded")) == "fresh"
+
+
+def test_stale_leader_does_not_drop_the_newer_load():
+    cache, stale, fresh = SharedCache(ttl=60), Gate("stale"), Gate("fresh")
+    old, _ = in_thread(lambda: cache.get(("orders",), stale))
+    assert stale.started.wait(10)
+    cache.invalidate(["orders"])
+    new, result = in_thread(lambda: cache.get(("orders",), fresh))
+    assert fresh.started.wait(10)
+    stale.release.set()
+    old.join(10)
+    # The newer load is still in flight, so another caller joins it
+    waiter, joined = in_thread(lambda: cache.get(("orders",), lambda: pytest.fail("second load")))
+    wait_for_waiters(cache, 1)
+    fresh.release.set()
+    new.join(10)
+    waiter.join(10)
+    assert result["value"] == joined["value"] == "fresh"
+
+
+def test_invalidate_keeps_other_tables():
+    cache = SharedCache(ttl=60)
+    cache.get(("orders",), lambda: 1)
+    cache.get(("foods",), lambda: 2)
+    cache.invalidate(["orders"])
+    assert cache.get(("orders",), lambda: 3) == 3
+    assert cache.get(("foods",), lambda: pytest.fail("reloaded")) == 2
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    cache = SharedCache(ttl=60, max_entries=2)
+    cache.get(("a",), lambda: "a")
+    cache.get(("b",), lambda: "b")
+    cache.get(("a",), lambda: pytest.fail("reloaded"))  # a is now more recent than b
+    cache.get(("c",), lambda: "c")
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+    assert cache.get(("a",), lambda: pytest.fail("reloaded")) == "a"
+    assert cache.get(("b",), lambda: "reloaded") == "reloaded"
+
+
+def test_evicts_beyond_max_bytes_but_keeps_the_newest_entry():
+    cache = SharedCache(ttl=60, max_bytes=3 * 2**20)
+    for name in ("a", "b"):
+        cache.get((name,), lambda: np.zeros(2**20, dtype=np.uint8))
+    assert cache.stats()["bytes"] == 2 * 2**20
+    cache.get(("c",), lambda: np.zeros(2 * 2**20, dtype=np.uint8))
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] == 3 * 2**20
+    # An entry larger than the whole budget is still kept on its own
+    cache.get(("huge",), lambda: np.zeros(4 * 2**20, dtype=np.uint8))
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 4 * 2**20
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.data.cache.time.monotonic", lambda: now[0])
+    cache = SharedCache(ttl=60)
+    cache.get(("orders",), lambda: "old")
+    now[0] += 59
+    assert cache.get(("orders",), lambda: "new") == "old"
+    now[0] += 2
+    assert cache.get(("orders",), lambda: "new") == "new"
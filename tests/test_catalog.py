@@ -0,0 +1,36 @@
+import pytest
+from src.data import catalog as catalog_module
+from src.data.catalog import MenuCatalog
+
+
+def food(id, category_id, name="Paneer Tikka"):
+    return {"id": id, "name": name, "description": "", "price": 199.0, "image_url": "", "available": True, "category_id": category_id}
+
+
+@pytest.fixture
+def menu(monkeypatch):
+    calls = []
+    monkeypatch.setattr(catalog_module, "invalidate_tables", lambda *tables: calls.append(tables))
+    catalog = MenuCatalog()
+    catalog.put_foods([food(1, 10), food(2, 10)])
+    calls.clear()
+    return catalog, calls
+
+
+@pytest.mark.parametrize("rows, invalidates", [
+    ([food(1, 10, name="Paneer Tikka Masala")], False),  # edit within the category
+    ([food(3, 11)], False),  # new food, no orders yet
+    ([food(2, 11)], True),  # moved to another category
+    ([food(1, 10), food(2, 12)], True),
+    ([], True),  # rows unknown
+])
+def test_put_foods_drops_the_cube_only_on_category_changes(menu, rows, invalidates):
+    catalog, calls = menu
+    catalog.put_foods(rows)
+    assert calls == ([("foods",)] if invalidates else [])
+
+
+def test_drop_food_always_drops_the_cube(menu):
+    catalog, calls = menu
+    catalog.drop_food(1)
+    assert calls == [("foods",)] and 1 not in catalog.foods
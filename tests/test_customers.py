@@ -0,0 +1,38 @@
+import pytest
+from src.data import customers
+from src.data.catalog import fetch_catalog
+from src.data.customers import CustomerIndex
+
+
+@pytest.fixture
+def food_categories(fake_client, monkeypatch):
+    monkeypatch.setattr(customers, "SNAPSHOT_DIR", None)
+    client = fake_client("2000")
+    return client, fetch_catalog()["foods"].set_index("id")["category_id"]
+
+
+def test_background_build_reports_progress(food_categories):
+    client, categories = food_categories
+    index = CustomerIndex()
+    assert not index.built
+    index.build_in_background(categories)
+    index.build_in_background(categories)  # already building: no second thread
+    assert index.wait_built(timeout=60)
+    assert index.build_error is None
+    assert index.loaded == {table: len(client.frame(table)[0]) for table in ("orders", "order_items")}
+    assert index.orders.sum() == len(client.frame("orders")[0])
+
+
+def test_failed_build_is_kept_and_retried(food_categories, monkeypatch):
+    client, categories = food_categories
+    index = CustomerIndex()
+    load_since = customers._load_since
+    monkeypatch.setattr(customers, "_load_since", lambda *a: (_ for _ in ()).throw(RuntimeError("backend down")))
+    index.build_in_background(categories)
+    assert not index.wait_built(timeout=60)
+    assert str(index.build_error) == "backend down"
+
+    monkeypatch.setattr(customers, "_load_since", load_since)
+    index.build_in_background(categories)
+    assert index.wait_built(timeout=60)
+    assert index.build_error is None
@@ -0,0 +1,26 @@
+import io
+import pandas as pd
+import pytest
+from src.data.export import export
+from src.data.repository import PAGE_SIZE
+
+START, END = pd.Timestamp("2025-01-01", tz="UTC"), pd.Timestamp("2025-07-01", tz="UTC")
+
+
+# One row per add-on, per item without add-ons, or per order without items
+def expected_rows(client):
+    orders, items, addons = (client.frame(t)[0] for t in ("orders", "order_items", "order_item_addons"))
+    orders = orders[(orders["created_at"] >= START) & (orders["created_at"] < END)]
+    items = items[items["order_id"].isin(orders["id"])]
+    per_item = addons["order_item_id"].value_counts().reindex(items["id"], fill_value=0).clip(lower=1)
+    return int(per_item.sum()) + int((~orders["id"].isin(items["order_id"])).sum())
+
+
+@pytest.mark.parametrize("chunk_orders", [300, PAGE_SIZE, 5 * PAGE_SIZE])
+def test_export_reads_every_page(fake_client, chunk_orders):
+    client = fake_client("20000", max_rows=PAGE_SIZE)
+    out = io.BytesIO()
+    rows = export(out, START, END, "csv", chunk_orders)
+    df = pd.read_csv(io.BytesIO(out.getvalue()))
+    assert rows == len(df) == expected_rows(client)
+    assert df["order_id"].is_monotonic_increasing
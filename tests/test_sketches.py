@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.sketches import REGISTERS, DailySketches, _registers, estimate, hash_users, sketch_rows
+from src.offline.data import generate
+
+# HyperLogLog sketches (src/data/sketches.py): the hash, register and rank must
+# match user_sketches() in sql/analytics_functions.sql bit for bit, and merged
+# estimates must stay within the sketch's error bound.
+
+# Three standard errors of a 4096-register sketch
+ERROR_BOUND = 3 * 1.04 / np.sqrt(REGISTERS)
+
+# user_id -> (first 8 bytes of md5 as a signed bigint, register = low 12 bits,
+# rank = 52 - bit length of the next 51 bits), worked out independently of the code
+GOLDEN = {
+    "user-1": (-2965778325353760010, 2806, 1),
+    "user-2": (4420509675368228755, 1939, 2),
+    "user-3": (1390154670021831841, 3233, 3),
+    "user-55": (480571526884067724, 2444, 5),
+    "user-334": (-9169128260596593414, 3322, 8),
+    "user-8011": (-9220726013716372021, 1483, 12),
+}
+
+
+def test_hash_register_and_rank_match_sql():
+    users = list(GOLDEN)
+    hashes = hash_users(users)
+    register, rank = _registers(hashes)
+    assert hashes.tolist() == [GOLDEN[u][0] for u in users]
+    assert register.tolist() == [GOLDEN[u][1] for u in users]
+    assert rank.tolist() == [GOLDEN[u][2] for u in users]
+
+
+def test_sketch_rows_layout():
+    orders = pd.DataFrame({
+        "user_id": ["user-1", "user-8011", "user-1", None],
+        "created_at": pd.to_datetime(["2025-03-01 23:59", "2025-03-01 08:00", "2025-03-02 00:00", "2025-03-02 01:00"], utc=True),
+    })
+    rows = sketch_rows(orders)
+    assert rows["day"].tolist() == ["2025-03-01", "2025-03-02"]
+    first = bytes.fromhex(rows["registers"].iloc[0])
+    assert len(first) == REGISTERS
+    assert first[2806] == 1 and first[1483] == 12
+    assert sum(1 for b in first if b) == 2
+    second = bytes.fromhex(rows["registers"].iloc[1])
+    assert second[2806] == 1 and sum(1 for b in second if b) == 1
+
+
+@pytest.mark.parametrize("n", [500, 5_000, 50_000, 200_000])
+def test_estimate_within_error_bound(n):
+    register, rank = _registers(hash_users([f"customer-{i}" for i in range(n)]))
+    registers = np.zeros(REGISTERS, dtype=np.uint8)
+    np.maximum.at(registers, register, rank)
+    assert abs(estimate(registers) - n) / n <= ERROR_BOUND
+
+
+def test_merged_days_within_error_bound():
+    orders = generate(50_000)["orders"]
+    sketches = DailySketches(sketch_rows(orders))
+    day = orders["created_at"].dt.tz_convert("UTC").dt.normalize()
+    ranges = [
+        (None, None, None),
+        ("2024-10-01", "2025-01-01", None),
+        ("2025-06-01", "2025-07-01", None),
+        (None, None, 4),
+    ]
+    for start, end, weekday in ranges:
+        mask = pd.Series(True, index=orders.index)
+        if start:
+            mask &= day >= pd.Timestamp(start, tz="UTC")
+        if end:
+            mask &= day < pd.Timestamp(end, tz="UTC")
+        if weekday is not None:
+            mask &= day.dt.weekday == weekday
+        exact = orders.loc[mask, "user_id"].nunique()
+        assert abs(sketches.unique(start, end, weekday) - exact) / exact <= ERROR_BOUND
@@ -0,0 +1,40 @@
+import pandas as pd
+from src.data import snapshot
+from src.data.repository import table_columns
+
+
+def test_pages_with_int_and_float_amounts_read_back(tmp_path):
+    # PostgREST sends 120.0 as 120, so one page can look integral and the next not
+    pages = [
+        pd.DataFrame({"id": [1, 2], "user_id": ["u1", "u2"], "amount": [120, 80],
+                      "created_at": pd.to_datetime(["2025-01-05", "2025-01-06"], utc=True)}),
+        pd.DataFrame({"id": [3], "user_id": ["u3"], "amount": [120.5],
+                      "created_at": pd.to_datetime(["2025-02-01"], utc=True)}),
+    ]
+    for page in pages:
+        snapshot._write_chunk(str(tmp_path / "orders"), page, f"part-{page['id'].iloc[0]}")
+
+    df = snapshot.read_frame(str(tmp_path), "orders", "id,user_id,amount,created_at")
+    assert df["amount"].dtype == "float64"
+    assert sorted(df["amount"].tolist()) == [80.0, 120.0, 120.5]
+
+
+def test_sync_matches_source(fake_client, tmp_path):
+    client = fake_client("3000")
+    snapshot.sync(str(tmp_path))
+    for table in ("orders", "order_items", "order_item_addons"):
+        columns = table_columns(table)
+        got = snapshot.read_frame(str(tmp_path), table, columns).sort_values("id", ignore_index=True)
+        want = client.frame(table)[0][columns.split(",")]
+        assert got["id"].tolist() == want["id"].tolist()
+        for column in columns.split(","):
+            assert got[column].astype(str).tolist() == want[column].astype(str).tolist(), column
+
+
+def test_old_format_is_rebuilt(fake_client, tmp_path):
+    fake_client("500")
+    snapshot.sync(str(tmp_path), tables=("orders",))
+    watermark = snapshot._read_watermark(str(tmp_path / "orders"))
+    assert watermark["format"] == snapshot.SNAPSHOT_FORMAT
+    snapshot._write_watermark(str(tmp_path / "orders"), {k: v for k, v in watermark.items() if k != "format"})
+    assert snapshot.sync(str(tmp_path), tables=("orders",)) == {"orders": 500}
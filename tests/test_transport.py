@@ -0,0 +1,49 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src import metrics, supabase_client
+
+
+class _EmptyList(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so the pool can reuse the connection
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"[]")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EmptyList)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+
+
+class _Get:
+    def __init__(self, http, url):
+        self.http, self.url = http, url
+
+    def execute(self):
+        return type("Response", (), {"data": self.http.get(self.url).json()})()
+
+
+def test_query_events_record_connection_reuse(server):
+    http = supabase_client._make_transport()
+    metrics.start_run()
+    for _ in range(3):
+        metrics._TracedQuery(_Get(http, server), "orders").execute()
+    events = metrics.current_run()
+    assert [(e["reused"], e["tls_handshake"]) for e in events] == [(False, False), (True, False), (True, False)]
+
+
+def test_offline_queries_have_no_connection_fields(fake_client):
+    client = metrics.instrument(fake_client())
+    metrics.start_run()
+    client.table("orders").select("id").limit(1).execute()
+    assert [(e["reused"], e["tls_handshake"]) for e in metrics.current_run()] == [(None, None)]
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+from src.data import sketches
+from src.data.sketches import DailySketches, counts_exactly, sketch_rows, unique_users
+
+
+def exact(client, start, end, weekday=None):
+    orders = client.frame("orders")[0]
+    orders = orders[(orders["created_at"] >= start) & (orders["created_at"] < end)]
+    if weekday is not None:
+        orders = orders[orders["created_at"].dt.weekday == weekday]
+    return orders["user_id"].nunique()
+
+
+@pytest.mark.parametrize("weekday", [None, 2])
+def test_short_ranges_are_exact(fake_client, weekday):
+    client = fake_client("5000")
+    start, end = pd.Timestamp("2025-03-03", tz="UTC"), pd.Timestamp("2025-03-10", tz="UTC")
+    assert counts_exactly(start, end)
+    assert unique_users(start, end, weekday) == exact(client, start, end, weekday)
+
+
+def test_long_ranges_use_the_sketches(fake_client, monkeypatch):
+    client = fake_client("5000")
+    start, end = pd.Timestamp("2025-01-01", tz="UTC"), pd.Timestamp("2025-03-01", tz="UTC")
+    assert not counts_exactly(start, end)
+    loaded = DailySketches(sketch_rows(client.frame("orders")[0]))
+    monkeypatch.setattr(sketches, "fetch_frame", lambda *a, **k: pytest.fail("read raw orders"))
+    assert unique_users(start, end, sketches=loaded) == loaded.unique(start, end)
+
+
+def test_exact_days_setting(fake_client, monkeypatch):
+    client = fake_client("5000")
+    start, end = pd.Timestamp("2025-03-01", tz="UTC"), pd.Timestamp("2025-04-01", tz="UTC")
+    monkeypatch.setattr(sketches, "EXACT_MAX_DAYS", 31)
+    assert unique_users(start, end) == exact(client, start, end)